@@ -17,6 +17,9 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 
+from common.instrumentation import query_stats
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('stats/queries/', query_stats, name='query-stats'),
 ]
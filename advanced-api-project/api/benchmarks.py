@@ -0,0 +1,106 @@
+"""
+Timing harness behind `manage.py run_benchmarks`.
+
+Each case is a view requested through the test client after a warmup; the
+per-round timings are summarised the way pytest-benchmark does (min, max,
+mean, stddev, median, ops) and written to a JSON document with the commit
+and machine it was measured on, so runs can be diffed across commits.
+"""
+import datetime
+import platform
+import statistics
+import subprocess
+import time
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def time_request(client, url, rounds, warmup, headers=None):
+    for _ in range(warmup):
+        client.get(url, headers=headers)
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(url, headers=headers)
+    # The capture is a live view of the query log, which later requests reset
+    queries = len(captured)
+    if response.status_code != 200:
+        raise RuntimeError(f'GET {url} returned {response.status_code}')
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        client.get(url, headers=headers)
+        timings.append(time.perf_counter() - started)
+    return {
+        'stats': summarize(timings),
+        'queries': queries,
+        'response_bytes': len(response.content),
+    }
+
+
+def summarize(timings):
+    mean = statistics.fmean(timings)
+    return {
+        'min': min(timings),
+        'max': max(timings),
+        'mean': mean,
+        'stddev': statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        'median': statistics.median(timings),
+        'rounds': len(timings),
+        'ops': 1 / mean if mean else None,
+    }
+
+
+def commit_info():
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {
+        'id': git('rev-parse', 'HEAD'),
+        'branch': git('rev-parse', '--abbrev-ref', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+    }
+
+
+def machine_info():
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'database': connection.vendor,
+    }
+
+
+def report(benchmarks):
+    return {
+        'datetime': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'commit_info': commit_info(),
+        'machine_info': machine_info(),
+        'benchmarks': benchmarks,
+    }
+
+
+def compare(current, baseline):
+    """Mean time change per benchmark against an earlier report, in percent."""
+    before = {bench['fullname']: bench for bench in baseline.get('benchmarks', [])}
+    changes = []
+    for bench in current['benchmarks']:
+        old = before.get(bench['fullname'])
+        if old is None:
+            continue
+        old_mean, new_mean = old['stats']['mean'], bench['stats']['mean']
+        changes.append({
+            'fullname': bench['fullname'],
+            'baseline_mean': old_mean,
+            'mean': new_mean,
+            'change_percent': round((new_mean - old_mean) / old_mean * 100, 2) if old_mean else None,
+            'queries': [old.get('queries'), bench.get('queries')],
+        })
+    return changes
@@ -0,0 +1,91 @@
+import datetime
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def list_version_key(model):
+    return f'conditional:list-version:{model._meta.label_lower}'
+
+
+def get_list_version(model):
+    """Time of the last write to `model`, in nanoseconds; lists change only when it does."""
+    key = list_version_key(model)
+    version = cache.get(key)
+    if version is None:
+        # Unknown after a cache flush: start now, which only costs clients a refetch
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key)
+    return version
+
+
+def bump_list_version(model):
+    """
+    Move the list version of `model` to now, once straight away, so the
+    writing request already sees it, and again on commit, so a reader that
+    queried before the commit cannot validate the old rows.
+    """
+    def bump():
+        cache.set(list_version_key(model), time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest())
+
+
+class ConditionalResponseMixin:
+    """
+    Adds ETag and Last-Modified validators to list and retrieve responses and
+    answers matching conditional GETs with 304 Not Modified.
+
+    Validators come without rendering the body, and without a query for
+    lists: the model's list version, which writes bump (receivers in
+    models.py), stands in for every list of it. Detail views use the
+    object's own `last_modified_field` timestamp.
+
+    List validators are only as fresh as the cache the version lives in,
+    so they depend on CACHES being shared by every worker (settings.py):
+    with a per-process cache, a worker that did not handle a write would
+    keep answering 304 for the old list.
+    """
+    last_modified_field = 'updated_at'
+
+    def list(self, request, *args, **kwargs):
+        version = get_list_version(self.get_queryset().model)
+        last_modified = datetime.datetime.fromtimestamp(version / 1e9, tz=datetime.timezone.utc)
+        return self.conditional_response(
+            request,
+            [version],
+            last_modified,
+            lambda: super(ConditionalResponseMixin, self).list(request, *args, **kwargs),
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        last_modified = getattr(instance, self.last_modified_field)
+        return self.conditional_response(
+            request,
+            [instance.pk, last_modified],
+            last_modified,
+            lambda: Response(self.get_serializer(instance).data),
+        )
+
+    def conditional_response(self, request, version, last_modified, render):
+        # The full path and format are part of the tag: filters, cursors and
+        # renderers all change the body
+        etag = make_etag(request.get_full_path(), request.accepted_renderer.format, *version)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp) or render()
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,75 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+
+from api.fast_serializers import ValuesSerializer
+from api.synthetic import generate_catalog
+from api.models import Book
+from api.serializers import BookSerializer
+
+
+def best_of(rounds, func):
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - started)
+    return result, {'min_ms': round(min(timings) * 1000, 3), 'median_ms': round(statistics.median(timings) * 1000, 3)}
+
+
+class Command(BaseCommand):
+    help = (
+        'Microbenchmark BookSerializer against the ValuesSerializer fast path '
+        'over --rows books in a throwaway test database, and print the timings '
+        'and speedups as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--rounds', type=int, default=10)
+
+    def handle(self, *args, **options):
+        if options['rows'] < 1 or options['rounds'] < 1:
+            raise CommandError('--rows and --rounds must be positive.')
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            generate_catalog(authors=max(1, options['rows'] // 10), books=options['rows'])
+            results = self.measure(Book.objects.order_by('pk'), options['rounds'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def measure(self, queryset, rounds):
+        fast = ValuesSerializer.compile(BookSerializer())
+        instances = list(queryset)
+        rows = list(queryset.values_list(*fast.columns))
+
+        slow_data, slow_serialize = best_of(rounds, lambda: BookSerializer(instances, many=True).data)
+        fast_data, fast_serialize = best_of(rounds, lambda: fast.to_representation(rows))
+        if JSONRenderer().render(slow_data) != JSONRenderer().render(fast_data):
+            raise CommandError('ValuesSerializer output differs from BookSerializer.')
+
+        _, slow_total = best_of(rounds, lambda: BookSerializer(list(queryset.all()), many=True).data)
+        _, fast_total = best_of(rounds, lambda: fast.to_representation(queryset.values_list(*fast.columns)))
+        return {
+            'rows': len(rows),
+            'rounds': rounds,
+            'serialize': {
+                'model_serializer': slow_serialize,
+                'values_serializer': fast_serialize,
+                'speedup': round(slow_serialize['median_ms'] / fast_serialize['median_ms'], 1),
+            },
+            'fetch_and_serialize': {
+                'model_serializer': slow_total,
+                'values_serializer': fast_total,
+                'speedup': round(slow_total['median_ms'] / fast_total['median_ms'], 1),
+            },
+            'identical_output': True,
+        }
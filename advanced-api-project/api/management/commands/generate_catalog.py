@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.synthetic import BATCH_SIZE, generate_catalog, scaled_counts
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create synthetic authors and books. --authors defaults to one per ten books.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=1000)
+        parser.add_argument('--authors', type=int)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options['books'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--books and --batch-size must be positive.')
+        counts = scaled_counts(options['books'])
+        if options['authors'] is not None:
+            counts['authors'] = options['authors']
+        created = generate_catalog(**counts, seed=options['seed'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Created {created['authors']} authors, {created['books']} books."))
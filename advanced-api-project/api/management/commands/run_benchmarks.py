@@ -0,0 +1,105 @@
+import json
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from common.cache import isolated_cache
+
+from api.benchmarks import compare, report, time_request
+from api.models import Book
+from api.pagination import KeysetCursorPagination
+from api.response_cache import NO_CACHE_HEADERS
+from api.synthetic import generate_catalog, scaled_counts
+
+
+def deep_cursor_url(url, ordering, position):
+    """Cursor link that resumes after the row at `position` in `ordering`."""
+    paginator = KeysetCursorPagination()
+    paginator.ordering = list(ordering)
+    paginator.base_url = 'http://testserver' + url
+    row = Book.objects.order_by(*ordering)[position]
+    return paginator.encode_cursor(row, reverse=False)
+
+
+def cases():
+    url = reverse('book-list')
+    middle = Book.objects.count() // 2
+    author = Book.objects.select_related('author').order_by('pk').first().author
+    return [
+        ('book_list', url),
+        ('book_list_ordered', url + '?ordering=-publication_year'),
+        ('book_list_search', url + '?search=Garden'),
+        ('book_list_filter_year', url + '?publication_year=1999'),
+        ('book_list_filter_author', url + '?author__name=' + author.name.replace(' ', '+')),
+        ('book_list_deep_cursor', deep_cursor_url(url + '?ordering=title', ['title', 'id'], middle)),
+        ('book_list_async', reverse('book-list-async') + '?search=Garden'),
+        # Every other case bypasses the response cache; this one is served from it
+        ('book_list_search_cached', url + '?search=Garden', {}),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark BookListView with filters, search, ordering and deep cursors '
+        'against synthetic catalogs of each --sizes book count, in a throwaway '
+        'test database, and print the results as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000', help='Comma separated book counts, e.g. 1000,100000,1000000.')
+        parser.add_argument('--rounds', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+        parser.add_argument('--compare', help='Earlier JSON report to compare mean times against.')
+
+    @isolated_cache()
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers.')
+        if any(size < 1 for size in sizes) or options['rounds'] < 1:
+            raise CommandError('Sizes and --rounds must be positive.')
+
+        benchmarks = []
+        # DEBUG off, as in production: no per-query logging overhead
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for size in sizes:
+                call_command('flush', interactive=False, verbosity=0)
+                counts = generate_catalog(**scaled_counts(size), seed=options['seed'])
+                cache.clear()
+                client = Client()
+                for name, url, *headers in cases():
+                    headers = headers[0] if headers else NO_CACHE_HEADERS
+                    result = time_request(client, url, options['rounds'], options['warmup'], headers)
+                    benchmarks.append({
+                        'name': name,
+                        'fullname': f'{name}[{size}]',
+                        'group': name,
+                        'params': {'rows': size, 'url': url},
+                        'catalog': counts,
+                        **result,
+                    })
+                    self.stderr.write(f"{name}[{size}]: {result['stats']['mean'] * 1000:.2f} ms, {result['queries']} queries")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        results = report(benchmarks)
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                results['comparison'] = compare(results, json.load(baseline))
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as out:
+                out.write(output + '\n')
+        else:
+            self.stdout.write(output)
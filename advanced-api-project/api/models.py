@@ -1,10 +1,23 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .object_cache import invalidate, invalidate_many
+from .conditional import bump_list_version
 
 # Create your models here.
 class Author(models.Model):
     # The author's name
     name = models.CharField(max_length=255)
 
+    class Meta:
+        indexes = [
+            # author__name filters on BookListView, ?ordering=name on AuthorListView
+            models.Index(fields=['name', 'id'], name='api_author_name_id_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -15,6 +28,56 @@ class Book(models.Model):
     publication_year = models.IntegerField()
     # ForeignKey relationship to Author model (many books can belong to one author)
     author = models.ForeignKey(Author, related_name='books', on_delete=models.CASCADE)
+    # Last write time, used for ETag / Last-Modified validators
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        # One index per filter/ordering shape BookListView exposes. Keyset
+        # pagination always appends id, so it ends every index and the
+        # page comes straight off the index without a sort.
+        indexes = [
+            models.Index(fields=['title', 'id'], name='api_book_title_id_idx'),
+            models.Index(fields=['title', 'publication_year', 'id'], name='api_book_title_year_idx'),
+            models.Index(fields=['publication_year', 'id'], name='api_book_year_id_idx'),
+            models.Index(fields=['publication_year', 'title', 'id'], name='api_book_year_title_idx'),
+            models.Index(fields=['author', 'title', 'id'], name='api_book_author_title_idx'),
+            models.Index(fields=['author', 'publication_year', 'id'], name='api_book_author_year_idx'),
+        ]
 
     def __str__(self):
         return self.title
+
+# Set while a bulk write invalidates its chunk itself
+_invalidating_in_bulk = ContextVar('invalidating_in_bulk', default=False)
+
+
+@contextmanager
+def invalidated_in_bulk(book_pks):
+    """
+    Mutes the per-row receivers below for the writes in the block, then
+    invalidates the given books once: one commit callback for their cached
+    objects and one list version bump, instead of both for every row.
+    """
+    token = _invalidating_in_bulk.set(True)
+    try:
+        yield
+    finally:
+        _invalidating_in_bulk.reset(token)
+    invalidate_many(Book, book_pks)
+    bump_list_version(Book)
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_book(sender, instance, **kwargs):
+    if not _invalidating_in_bulk.get():
+        invalidate(Book, instance.pk)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_book_lists(sender, **kwargs):
+    if not _invalidating_in_bulk.get():
+        bump_list_version(Book)
@@ -0,0 +1,132 @@
+"""
+Read-through cache of single objects for the detail views.
+
+A write retires an object's cached copies by bumping its version key in
+the default cache, which every lookup reads first, so a worker that did
+not handle the write sees it on its next lookup. That depends on CACHES
+being shared by all workers (settings.py, common/cache.py); with a
+per-process cache, other workers would serve the old object for up to
+OBJECT_CACHE_TIMEOUT.
+"""
+import time
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+# Bump when the cached representation changes shape
+CACHE_FORMAT = 1
+OBJECT_CACHE_TIMEOUT = 60 * 10
+# Entries older than this are refreshed by one request while others keep
+# serving the old copy
+OBJECT_REFRESH_AFTER = 60 * 5
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.5
+LOCK_POLL = 0.05
+
+
+def object_key(model, pk):
+    return f'objcache:{CACHE_FORMAT}:{model._meta.label_lower}:{pk}'
+
+
+def version_key(model, pk):
+    return f'objcache:version:{model._meta.label_lower}:{pk}'
+
+
+def _new_version():
+    # Seeding from the clock means an evicted counter never reuses an old version
+    return time.time_ns()
+
+
+def get_or_load(model, pk, loader):
+    """
+    Read-through lookup of one object.
+
+    Entries are stored as (version, refresh_at, obj) and only trusted while
+    their version matches the object's current version, which writes bump.
+    A per-key lock lets a single caller rebuild a missing or ageing entry.
+    """
+    key, vkey = object_key(model, pk), version_key(model, pk)
+    found = cache.get_many([key, vkey])
+    version = found.get(vkey)
+    if version is None:
+        cache.add(vkey, _new_version(), None)
+        version = cache.get(vkey)
+    entry = found.get(key)
+
+    if entry is not None and entry[0] == version:
+        if time.time() < entry[1] or not _acquire(key):
+            return entry[2]
+        return _load_and_store(key, version, loader, locked=True)
+
+    if _acquire(key):
+        return _load_and_store(key, version, loader, locked=True)
+    # Someone else is loading it: wait briefly for their result
+    deadline = time.time() + LOCK_WAIT
+    while time.time() < deadline:
+        time.sleep(LOCK_POLL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[2]
+    return _load_and_store(key, version, loader, locked=False)
+
+
+def invalidate(model, pk):
+    """Make every cached copy of the object stale once the write commits."""
+    def bump():
+        vkey = version_key(model, pk)
+        try:
+            cache.incr(vkey)
+        except ValueError:
+            cache.set(vkey, _new_version(), None)
+        cache.delete(object_key(model, pk))
+    transaction.on_commit(bump)
+
+
+def invalidate_many(model, pks):
+    """
+    invalidate() for a batch of objects: one commit callback and two cache
+    round trips instead of a callback and an incr per object.
+    """
+    pks = list(pks)
+
+    def bump():
+        # A fresh clock version differs from every version handed out before
+        cache.set_many(dict.fromkeys((version_key(model, pk) for pk in pks), _new_version()), None)
+        cache.delete_many([object_key(model, pk) for pk in pks])
+    transaction.on_commit(bump)
+
+
+def _acquire(key):
+    return cache.add(key + ':lock', 1, LOCK_TIMEOUT)
+
+
+def _load_and_store(key, version, loader, locked):
+    try:
+        obj = loader()
+        refresh_at = time.time() + OBJECT_REFRESH_AFTER
+        cache.set(key, (version, refresh_at, obj), OBJECT_CACHE_TIMEOUT)
+        return obj
+    finally:
+        if locked:
+            cache.delete(key + ':lock')
+
+
+class CachedRetrieveMixin:
+    """
+    Serves get_object() for detail requests from the object cache, keyed by
+    model and pk. Object permissions are still checked on every request.
+    """
+
+    def get_object(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if self.request.method != 'GET' or self.lookup_field != 'pk':
+            return super().get_object()
+        model = self.get_queryset().model
+        try:
+            pk = model._meta.pk.to_python(self.kwargs[lookup_url_kwarg])
+        except ValidationError:
+            return super().get_object()
+        obj = get_or_load(model, pk, super().get_object)
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,186 @@
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination that seeks on the row values of the active ordering
+    instead of using OFFSET, so deep pages cost the same as the first one.
+
+    The ordering is whatever the filter chain (e.g. OrderingFilter) left on
+    the queryset, with `tie_breaker` appended so every position is unique.
+    """
+    cursor_query_param = 'cursor'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    tie_breaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Same as paginate_queryset, reading the page through the async ORM."""
+        return self.set_page([obj async for obj in self.page_queryset(queryset, request)])
+
+    def page_queryset(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        position, self.reverse = self.decode_cursor(request, queryset.model)
+        self.has_cursor = position is not None
+
+        # Walking backwards is a forward walk over the inverted ordering.
+        ordering = [self._invert(field) for field in self.ordering] if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, position))
+
+        # One extra row tells us whether there is a next page
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        self.has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if self.reverse:
+            self.page.reverse()
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, queryset):
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not ordering:
+            ordering = list(queryset.model._meta.ordering)
+        names = [field.lstrip('-') for field in ordering]
+        if self.tie_breaker not in names:
+            # Follow the direction of the leading field so one index scan
+            # can serve the whole ordering.
+            descending = bool(ordering) and ordering[0].startswith('-')
+            ordering.append('-' + self.tie_breaker if descending else self.tie_breaker)
+        return ordering
+
+    def seek_filter(self, ordering, position):
+        """
+        Build the row-value comparison `(f1, f2, ...) > (v1, v2, ...)` as a
+        disjunction, honouring the direction of each field.
+        """
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = '__lt' if field.startswith('-') else '__gt'
+            equal = {ordering[i].lstrip('-'): position[i] for i in range(index)}
+            clauses.append(Q(**equal) & Q(**{name + lookup: position[index]}))
+        return reduce(or_, clauses)
+
+    def get_next_link(self):
+        if self.reverse:
+            # We came from a later page, so there is always one to return to.
+            if not self.page:
+                return None
+        elif not self.has_more:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.reverse:
+            if not self.has_more:
+                return None
+        elif not self.has_cursor:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            reverse = bool(payload.get('r', False))
+            ordering = payload['o']
+        except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering or not isinstance(position, list) or len(position) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            # The values go straight into the seek filter, so they must be
+            # valid for their columns, not just well-formed JSON
+            position = [
+                self._to_python(model, field.lstrip('-'), value) for field, value in zip(ordering, position)
+            ]
+        except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        payload = {
+            'o': self.ordering,
+            'p': [self._field_value(instance, field.lstrip('-')) for field in self.ordering],
+        }
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def _field_value(self, instance, field):
+        value = instance
+        for attr in field.split('__'):
+            value = getattr(value, attr)
+        # Orderings on a relation compare by its primary key.
+        return getattr(value, 'pk', value)
+
+    def _to_python(self, model, field, value):
+        names = field.split('__')
+        for name in names[:-1]:
+            model = model._meta.get_field(name).related_model
+        model_field = model._meta.get_field(names[-1])
+        if model_field.is_relation:
+            # Relations are encoded as their primary key, see _field_value()
+            model_field = model_field.target_field
+        if value is None or isinstance(value, (dict, list)):
+            raise ValueError(value)
+        return model_field.to_python(value)
+
+    def _invert(self, field):
+        return field[1:] if field.startswith('-') else '-' + field
+
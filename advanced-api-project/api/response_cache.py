@@ -0,0 +1,144 @@
+"""
+Response cache for book list queries.
+
+Clients repeat the same filter/search/ordering combinations, so
+CachedListMixin keeps the data of recent list responses, with their ETag
+and Last-Modified validators, in a bounded LRU in this process. A hit
+answers without touching the ORM, including conditional GETs.
+
+Entries are keyed on a normalized query string: parameters the view does
+not read are dropped, the rest are sorted by name, and values are only
+lowercased where matching is already case-insensitive (search). Each
+entry carries the list version it was built under (see conditional.py).
+Any Book or Author write bumps that version in the default cache, and
+every lookup reads it back from there, so entries in every process go
+stale on their next lookup. That relies on CACHES being shared by all
+workers (common/cache.py, and the common.W001 deploy check); with a
+per-process cache, other workers would keep serving old pages until the
+entries expire, RESPONSE_CACHE_TTL seconds after they were stored.
+
+A request sent with `Cache-Control: no-cache` skips the lookup and
+refreshes its entry; the benchmarks use it to time the uncached path.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .conditional import get_list_version
+
+RESPONSE_CACHE_TTL = 60
+RESPONSE_CACHE_SIZE = 500
+VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+# Request headers that bypass the cached copy
+NO_CACHE_HEADERS = {'Cache-Control': 'no-cache'}
+
+
+class LocalResponseCache:
+    """Thread-safe LRU of (version, data, headers), each expiring after `ttl` seconds."""
+
+    def __init__(self, size=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, version):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic() or entry[1] != version:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry[2], entry[3]
+
+    def set(self, key, version, data, headers):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + self.ttl, version, data, headers)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+local_responses = LocalResponseCache()
+
+
+class CachedListMixin:
+    """
+    Serves GET list requests from `local_responses`. Goes first in the
+    bases, so that on a hit none of the other list mixins run;
+    authentication and permissions still run per request.
+    """
+
+    def cached_query_params(self):
+        """Query parameters that change the response; everything else is ignored."""
+        params = {
+            getattr(self, 'search_param', None) or 'search',
+            getattr(self, 'ordering_param', None) or 'ordering',
+            getattr(self, 'fields_query_param', None),
+            getattr(self, 'omit_query_param', None),
+            *getattr(self, 'filterset_fields', ()),
+        }
+        paginator = self.paginator
+        if paginator is not None:
+            params.add(getattr(paginator, 'cursor_query_param', None))
+            params.add(getattr(paginator, 'page_size_query_param', None))
+        params.discard(None)
+        return params
+
+    def case_insensitive_params(self):
+        return {getattr(self, 'search_param', None) or 'search'}
+
+    def skips_cached_copy(self, request):
+        directives = request.headers.get('Cache-Control', '').lower()
+        return 'no-cache' in (directive.strip() for directive in directives.split(','))
+
+    def response_cache_key(self, request):
+        cached = self.cached_query_params()
+        folded = self.case_insensitive_params()
+        parts = []
+        for name in sorted(name for name in request.query_params if name in cached):
+            for value in request.query_params.getlist(name):
+                value = value.strip()
+                if name in folded and value.isascii():
+                    # Only ASCII: SQLite's LIKE does not fold other letters
+                    value = ' '.join(value.lower().split())
+                if value:
+                    parts.append((name, value))
+        # Pagination links are absolute, so the host is part of the key
+        return (request.scheme, request.get_host(), request.path, tuple(parts))
+
+    def list(self, request, *args, **kwargs):
+        stream_param = getattr(self, 'stream_query_param', None)
+        if request.method != 'GET' or (stream_param and stream_param in request.query_params):
+            return super().list(request, *args, **kwargs)
+        key = self.response_cache_key(request)
+        version = get_list_version(self.get_queryset().model)
+        entry = None if self.skips_cached_copy(request) else local_responses.get(key, version)
+        if entry is not None:
+            data, headers = entry
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(headers.get('Last-Modified', '')),
+            ) or Response(data)
+            for name, value in headers.items():
+                response[name] = value
+            return response
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and isinstance(response, Response):
+            headers = {name: response[name] for name in VALIDATOR_HEADERS if name in response}
+            local_responses.set(key, version, response.data, headers)
+        return response
@@ -1,8 +1,10 @@
 from rest_framework import serializers
 from .models import Author, Book
+from .projection import SparseFieldsetSerializerMixin
 from datetime import datetime
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # ?fields= / ?omit= on the book views trim this to the requested fields
     class Meta:
         model = Book
         fields = '__all__'  # Serialize all model fields
@@ -24,3 +26,24 @@ class AuthorSerializer(serializers.ModelSerializer):
         model = Author
         fields = ['name', 'books']
 
+
+
+class PreloadedAuthorField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves author ids from an `authors` dict in the serializer context
+    when one is given, so validating a batch does not query once per row.
+    """
+    def to_internal_value(self, data):
+        authors = self.context.get('authors')
+        if authors is None:
+            return super().to_internal_value(data)
+        try:
+            return authors[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+class BookBulkSerializer(BookSerializer):
+    # Same rules as BookSerializer, with batch-friendly author lookup
+    author = PreloadedAuthorField(queryset=Author.objects.all())
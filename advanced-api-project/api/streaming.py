@@ -0,0 +1,55 @@
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingListMixin:
+    """
+    Adds a streaming export mode to a ListAPIView.
+
+    `?stream=json` returns one JSON array and `?stream=ndjson` one object per
+    line. Rows are read with a server-side iterator and serialized in batches,
+    so memory stays flat however many rows match the filters.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = 2000
+    stream_content_types = {
+        'json': 'application/json',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def list(self, request, *args, **kwargs):
+        mode = request.query_params.get(self.stream_query_param)
+        if mode is None:
+            return super().list(request, *args, **kwargs)
+        if mode not in self.stream_content_types:
+            raise ValidationError({self.stream_query_param: f"Must be one of: {', '.join(self.stream_content_types)}."})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        chunks = self.stream_ndjson(queryset) if mode == 'ndjson' else self.stream_json(queryset)
+        return StreamingHttpResponse(chunks, content_type=self.stream_content_types[mode])
+
+    def stream_batches(self, queryset):
+        batch = []
+        for obj in queryset.iterator(chunk_size=self.stream_chunk_size):
+            batch.append(obj)
+            if len(batch) == self.stream_chunk_size:
+                yield self.get_serializer(batch, many=True).data
+                batch = []
+        if batch:
+            yield self.get_serializer(batch, many=True).data
+
+    def stream_json(self, queryset):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        yield '['
+        first = True
+        for rows in self.stream_batches(queryset):
+            body = ','.join(encoder.encode(row) for row in rows)
+            yield body if first else ',' + body
+            first = False
+        yield ']'
+
+    def stream_ndjson(self, queryset):
+        encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        for rows in self.stream_batches(queryset):
+            yield ''.join(encoder.encode(row) + '\n' for row in rows)
@@ -0,0 +1,68 @@
+"""
+Synthetic authors and books for load testing and benchmarks.
+
+Rows are written with bulk_create in chunked transactions, so the
+post_save cache invalidation does not run; load into a fresh database or
+clear the cache afterwards. Cached book lists are invalidated at the end.
+"""
+import random
+
+from django.db import transaction
+
+from .models import Author, Book
+from .conditional import bump_list_version
+
+BATCH_SIZE = 5000
+WORDS = [
+    'Silent', 'Hidden', 'Golden', 'Broken', 'Distant', 'Secret', 'Burning', 'Quiet', 'Lost', 'Northern',
+    'Garden', 'River', 'Kingdom', 'Letter', 'Harbor', 'Mountain', 'Library', 'Winter', 'Promise', 'Empire',
+]
+SURNAMES = ['Adams', 'Baker', 'Clarke', 'Davies', 'Evans', 'Foster', 'Green', 'Hughes', 'Irwin', 'Jones']
+
+
+def scaled_counts(books):
+    return {'authors': max(1, books // 10), 'books': books}
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk(model, objects, batch_size):
+    for chunk in _chunks(objects, batch_size):
+        with transaction.atomic():
+            created = model.objects.bulk_create(chunk, batch_size=batch_size)
+        yield from created
+
+
+def generate_catalog(authors, books, seed=0, batch_size=BATCH_SIZE):
+    """Add `authors` authors and `books` books spread across them; returns the counts."""
+    rng = random.Random(seed)
+    author_ids = [
+        author.pk for author in _bulk(
+            Author,
+            (Author(name=f'{rng.choice(SURNAMES)} {i}') for i in range(authors)),
+            batch_size,
+        )
+    ]
+    created = sum(1 for _ in _bulk(
+        Book,
+        (
+            Book(
+                title=f'{rng.choice(WORDS)} {rng.choice(WORDS)} {i}',
+                publication_year=rng.randint(1900, 2025),
+                author_id=rng.choice(author_ids),
+            )
+            for i in range(books)
+        ),
+        batch_size,
+    ))
+    bump_list_version(Book)
+    return {'authors': len(author_ids), 'books': created}
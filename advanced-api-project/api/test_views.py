@@ -1,7 +1,23 @@
+import base64
+import json
+import unittest
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from common.instrumentation import clear_stats, get_buffer
 from .models import Book, Author
+from .async_views import AsyncAPIView
+from .fast_serializers import FastListMixin
+from .response_cache import LocalResponseCache
+from .views import BookListView
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
 
@@ -21,8 +37,8 @@ class BookAPITestCase(APITestCase):
         url = reverse('book-list')  # Assuming you named this URL path 'book-list'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIsInstance(response.data, list)
-        self.assertGreaterEqual(len(response.data), 1)
+        self.assertIsInstance(response.data['results'], list)
+        self.assertGreaterEqual(len(response.data['results']), 1)
 
     def test_create_book_authenticated(self):
         url = reverse('book-create')  # Assuming this name for create view
@@ -69,14 +85,14 @@ class BookAPITestCase(APITestCase):
         url = reverse('book-list') + '?title=Test Book'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        for book in response.data:
+        for book in response.data['results']:
             self.assertIn("Test Book", book['title'])
 
     def test_search_books(self):
         url = reverse('book-list') + '?search=Test'
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(any("Test" in book['title'] for book in response.data))
+        self.assertTrue(any("Test" in book['title'] for book in response.data['results']))
 
     def test_order_books(self):
         # Assuming multiple books; since we only have one, this is a minimal test
@@ -84,15 +100,598 @@ class BookAPITestCase(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_cursor_pagination_walks_all_books(self):
+        author = self.book.author
+        for year in (2001, 2001, 2001, 2002, 2003):
+            Book.objects.create(title="Paged Book", publication_year=year, author=author)
+        expected = list(Book.objects.order_by('-publication_year', '-id').values_list('id', flat=True))
+
+        url = reverse('book-list') + '?ordering=-publication_year&page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(book['id'] for book in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+        # Walk back from the last page using the previous links
+        previous = response.data['previous']
+        backwards = []
+        while previous:
+            response = self.client.get(previous)
+            backwards = [book['id'] for book in response.data['results']] + backwards
+            previous = response.data['previous']
+        self.assertEqual(backwards, expected[:len(backwards)])
+        self.assertEqual(backwards[0], expected[0])
+
+    def test_cursor_pagination_with_filter(self):
+        Book.objects.create(title="Other Book", publication_year=2020, author=self.book.author)
+        url = reverse('book-list') + '?publication_year=2020&ordering=title&page_size=1'
+        response = self.client.get(url)
+        self.assertEqual([b['title'] for b in response.data['results']], ["Other Book"])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([b['title'] for b in response.data['results']], ["Test Book"])
+        self.assertIsNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse('book-list') + '?cursor=garbage')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_invalid_values(self):
+        # Well-formed cursors for this ordering, carrying values no column can hold
+        for bad in ({}, None, 'not-a-year'):
+            payload = {'o': ['publication_year', 'id'], 'p': [bad, 1]}
+            tampered = base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+            for name in ('book-list', 'book-list-async'):
+                response = self.client.get(reverse(name), {'ordering': 'publication_year', 'cursor': tampered})
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, (name, bad))
+
+    def test_stream_books_json(self):
+        Book.objects.create(title="Streamed Book", publication_year=2021, author=self.book.author)
+        response = self.client.get(reverse('book-list') + '?stream=json&ordering=title')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual([book['title'] for book in data], ["Streamed Book", "Test Book"])
+
+    def test_stream_books_ndjson_with_filter(self):
+        Book.objects.create(title="Streamed Book", publication_year=2021, author=self.book.author)
+        response = self.client.get(reverse('book-list') + '?stream=ndjson&publication_year=2021')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ["Streamed Book"])
+
+    def test_streamed_queries_are_counted_once_the_stream_ends(self):
+        clear_stats()
+        response = self.client.get(reverse('book-list') + '?stream=ndjson')
+        self.assertEqual(len(get_buffer()), 0)
+        with CaptureQueriesContext(connection) as queries:
+            b''.join(response.streaming_content)
+        entry = get_buffer()[-1]
+        self.assertEqual(entry['view'], 'book-list')
+        self.assertGreaterEqual(entry['queries'], len(queries))
+        self.assertGreater(len(queries), 0)
+
+    def test_stream_books_invalid_mode(self):
+        response = self.client.get(reverse('book-list') + '?stream=xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_unauthenticated_access_restrictions(self):
         # Try to update without auth
         url = reverse('book-update', args=[self.book.id])
         data = {"title": "Unauthorized Update"}
         response = self.client.put(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-    
+
+
+
+class BookDetailCacheTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="Cached Author")
+        cls.book = Book.objects.create(title="Hot Book", publication_year=2020, author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('book-detail', args=[self.book.id])
+
+    def test_repeat_reads_skip_the_database(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['title'], "Hot Book")
+
+    def test_save_invalidates_cached_copy(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.title = "Renamed Book"
+            self.book.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['title'], "Renamed Book")
+
+    def test_delete_invalidates_cached_copy(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Book.objects.filter(pk=self.book.pk).delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookConditionalGetTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Etag Author")
+        cls.book = Book.objects.create(title="Etag Book", publication_year=2020, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_list_not_modified_until_a_book_changes(self):
+        url = reverse('book-list') + '?ordering=title'
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        # Validators are cached with the response: no query at all
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Book.objects.create(title="New Etag Book", publication_year=2021, author=self.author)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_changes_on_delete(self):
+        Book.objects.create(title="Doomed Book", publication_year=2019, author=self.author)
+        url = reverse('book-list')
+        etag = self.client.get(url)['ETag']
+        Book.objects.filter(title="Doomed Book").delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_list_etag_changes_on_author_write(self):
+        url = reverse('book-list') + '?author__name=Etag+Author'
+        etag = self.client.get(url)['ETag']
+        self.author.name = "Renamed Etag Author"
+        self.author.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query(self):
+        etag = self.client.get(reverse('book-list'))['ETag']
+        response = self.client.get(reverse('book-list') + '?search=Etag', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self):
+        url = reverse('book-detail', args=[self.book.id])
+        last_modified = self.client.get(url)['Last-Modified']
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class AsyncBookViewsTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Async Author")
+        other = Author.objects.create(name="Other Author")
+        for year, title in [(2001, "Gamma"), (1999, "Alpha"), (2010, "Beta")]:
+            Book.objects.create(title=title, publication_year=year, author=cls.author)
+        cls.other_book = Book.objects.create(title="Delta", publication_year=2005, author=other)
+
+    def assertSameAsSync(self, query):
+        sync = self.client.get(reverse('book-list') + query)
+        native = self.client.get(reverse('book-list-async') + query)
+        self.assertEqual(native.status_code, sync.status_code)
+        results = native.json()['results']
+        self.assertEqual(results, json.loads(json.dumps(sync.data['results'])))
+        return results
+
+    def test_base_view_is_not_routable(self):
+        with self.assertRaises(ImproperlyConfigured):
+            AsyncAPIView.as_view()
+
+    def test_filter_search_and_ordering_match_sync_view(self):
+        self.assertSameAsSync('')
+        self.assertSameAsSync('?ordering=-publication_year')
+        self.assertSameAsSync('?search=Other')
+        self.assertSameAsSync('?author__name=Async+Author&ordering=title')
+        results = self.assertSameAsSync('?publication_year=2005')
+        self.assertEqual([row['title'] for row in results], ["Delta"])
+
+    def test_cursor_pages_match_sync_view(self):
+        query = '?ordering=title&page_size=2'
+        native = self.client.get(reverse('book-list-async') + query).json()
+        self.assertEqual([row['title'] for row in native['results']], ["Alpha", "Beta"])
+        self.assertIn('/books/async/', native['next'])
+        rest = self.client.get(native['next']).json()
+        self.assertEqual([row['title'] for row in rest['results']], ["Delta", "Gamma"])
+        self.assertIsNone(rest['next'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(reverse('book-list-async') + '?cursor=bogus')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_filter_is_bad_request(self):
+        response = self.client.get(reverse('book-list-async') + '?publication_year=soon')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('publication_year', response.json())
+
+    def test_token_auth_matches_sync_view(self):
+        user = User.objects.create_user(username='asyncreader', password='testpass123')
+        token = Token.objects.create(user=user)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + token.key)
+        self.assertEqual(self.client.get(reverse('book-list-async')).status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION='Token wrong')
+        sync = self.client.get(reverse('book-list'))
+        native = self.client.get(reverse('book-list-async'))
+        self.assertEqual(native.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(native.json(), sync.data)
+        self.assertEqual(native['WWW-Authenticate'], sync['WWW-Authenticate'])
+
+    @override_settings(SERVER_TIMING=True)
+    def test_queries_are_timed_on_the_async_path(self):
+        response = self.client.get(reverse('book-list-async'))
+        self.assertIn('desc="1 queries"', response['Server-Timing'])
+        response = self.client.get(reverse('book-list'))
+        self.assertIn('dup;desc="0 duplicates"', response['Server-Timing'])
+
+    def test_detail(self):
+        response = self.client.get(reverse('book-detail-async', args=[self.other_book.id]))
+        self.assertEqual(response.json()['title'], "Delta")
+        response = self.client.get(reverse('book-detail-async', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BookBulkAPITestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Bulk Author")
+        cls.user = User.objects.create_user(username='bulkuser', password='testpass123')
+        cls.token = Token.objects.create(user=cls.user)
+
     def setUp(self):
-        self.user = User.objects.create_user(username='testuser', password='testpass123')
-        login_successful = self.client.login(username='testuser', password='testpass123')
-        self.assertTrue(login_successful)
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + self.token.key)
+        self.url = reverse('book-bulk')
+
+    def test_bulk_create_reports_invalid_rows(self):
+        data = [
+            {"title": "Bulk 1", "publication_year": 2001, "author": self.author.id},
+            {"title": "Bulk 2", "publication_year": 3000, "author": self.author.id},
+            {"title": "Bulk 3", "publication_year": 2003, "author": 999999},
+            {"title": "Bulk 4", "publication_year": 2004, "author": self.author.id},
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([b['title'] for b in response.data['created']], ["Bulk 1", "Bulk 4"])
+        self.assertEqual([e['index'] for e in response.data['errors']], [1, 2])
+        self.assertIn('publication_year', response.data['errors'][0]['errors'])
+        self.assertIn('author', response.data['errors'][1]['errors'])
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_bulk_create_query_count_does_not_grow_with_rows(self):
+        data = [{"title": f"Bulk {i}", "publication_year": 2000, "author": self.author.id} for i in range(200)]
+        # Token lookup, author preload, and one INSERT inside its savepoint pair
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Book.objects.count(), 200)
+
+    def test_bulk_update(self):
+        first = Book.objects.create(title="Old 1", publication_year=2000, author=self.author)
+        second = Book.objects.create(title="Old 2", publication_year=2000, author=self.author)
+        data = [
+            {"id": first.id, "title": "New 1"},
+            {"id": second.id, "publication_year": 3000},
+            {"id": 999999, "title": "Missing"},
+        ]
+        response = self.client.patch(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([b['title'] for b in response.data['updated']], ["New 1"])
+        self.assertEqual([e['index'] for e in response.data['errors']], [1, 2])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.title, "New 1")
+        self.assertEqual(second.publication_year, 2000)
+
+    def test_bulk_delete(self):
+        books = [Book.objects.create(title=f"Gone {i}", publication_year=2000, author=self.author) for i in range(3)]
+        response = self.client.delete(self.url, [books[0].id, books[1].id], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['deleted'], [books[0].id, books[1].id])
+        self.assertEqual(list(Book.objects.values_list('id', flat=True)), [books[2].id])
+
+    def test_bulk_delete_invalidates_once_per_chunk(self):
+        books = [Book.objects.create(title=f"Gone {i}", publication_year=2000, author=self.author) for i in range(20)]
+        cache.clear()
+        detail = reverse('book-detail', args=[books[0].id])
+        self.client.get(detail)
+        etag = self.client.get(reverse('book-list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.delete(self.url, [book.id for book in books], format='json')
+        # One object cache and one list version callback, not one per row
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(self.client.get(detail).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('book-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'], [])
+
+    def test_bulk_delete_still_sends_delete_signals(self):
+        books = [Book.objects.create(title=f"Gone {i}", publication_year=2000, author=self.author) for i in range(3)]
+        deleted = []
+
+        def record(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+        post_delete.connect(record, sender=Book)
+        self.addCleanup(post_delete.disconnect, record, sender=Book)
+        self.client.delete(self.url, [book.id for book in books], format='json')
+        self.assertEqual(sorted(deleted), [book.id for book in books])
+
+    def test_bulk_requires_list_and_authentication(self):
+        response = self.client.post(self.url, {"title": "Single"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.credentials()
+        response = self.client.post(self.url, [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AuthorAPITestCase(APITestCase):
+
+    def create_authors(self, count, books_per_author=3):
+        authors = Author.objects.bulk_create(Author(name=f"Author {i}") for i in range(count))
+        Book.objects.bulk_create(
+            Book(title=f"{author.name} Book {n}", publication_year=2000 + n, author=author)
+            for author in authors
+            for n in range(books_per_author)
+        )
+        return authors
+
+    def test_author_list_query_count_is_constant(self):
+        url = reverse('author-list') + '?page_size=1000'
+        for count in (1, 1000):
+            Author.objects.all().delete()
+            self.create_authors(count)
+            # One query for the authors, one for all of their books
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['results']), count)
+            self.assertEqual(len(response.data['results'][0]['books']), 3)
+
+    def test_author_detail_filters_prefetched_books(self):
+        author = self.create_authors(1)[0]
+        url = reverse('author-detail', args=[author.id]) + '?book_year_min=2001'
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([b['publication_year'] for b in response.data['books']], [2001, 2002])
+
+
+class BookSparseFieldsetTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="Ursula K. Le Guin")
+        cls.books = Book.objects.bulk_create(
+            Book(title=f"Earthsea {i}", publication_year=1968 + i, author=author) for i in range(5)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_trims_response_and_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('book-list'), {'fields': 'id,title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([set(book) for book in response.data['results']], [{'id', 'title'}] * 5)
+        page_query = queries[-1]['sql']
+        self.assertIn('"api_book"."title"', page_query)
+        self.assertNotIn('"api_book"."publication_year"', page_query)
+        self.assertNotIn('"api_book"."author_id"', page_query)
+
+    def test_omit_drops_fields(self):
+        response = self.client.get(reverse('book-list'), {'omit': 'author,updated_at'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'publication_year'})
+        response = self.client.get(reverse('book-list'), {'fields': 'id,title,author', 'omit': 'author'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    def test_ordering_fields_are_loaded_for_cursors(self):
+        url = reverse('book-list')
+        params = {'fields': 'title', 'ordering': '-publication_year', 'page_size': 2}
+        # Only the page: reading the cursor fields costs nothing extra
+        with self.assertNumQueries(1):
+            response = self.client.get(url, params)
+        self.assertEqual(response.data['results'], [{'title': 'Earthsea 4'}, {'title': 'Earthsea 3'}])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(response.data['results'], [{'title': 'Earthsea 2'}, {'title': 'Earthsea 1'}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('book-list'), {'fields': 'title,isbn'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('isbn', str(response.data['fields']))
+
+    def test_detail_and_async_views(self):
+        book = self.books[0]
+        response = self.client.get(reverse('book-detail', args=[book.pk]), {'fields': 'title'})
+        self.assertEqual(response.data, {'title': 'Earthsea 0'})
+        response = self.client.get(reverse('book-detail-async', args=[book.pk]), {'omit': 'updated_at'})
+        self.assertEqual(set(response.json()), {'id', 'title', 'publication_year', 'author'})
+        response = self.client.get(reverse('book-list-async'), {'fields': 'id'})
+        self.assertEqual(response.json()['results'][0], {'id': book.pk})
+
+
+class BookFastListTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        authors = Author.objects.bulk_create(Author(name=f"Author {i}") for i in range(3))
+        Book.objects.bulk_create(
+            Book(title=f"Book {i:02d}", publication_year=1950 + i % 7, author=authors[i % 3]) for i in range(30)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def get_both(self, url):
+        fast = self.client.get(url)
+        cache.clear()
+        with mock.patch.object(FastListMixin, 'get_values_serializer', return_value=None):
+            slow = self.client.get(url)
+        return fast, slow
+
+    def test_output_is_byte_identical(self):
+        base = reverse('book-list')
+        for query in ('', 'ordering=-publication_year&page_size=7', 'fields=title,updated_at',
+                      'author__name=Author+1&ordering=title', 'search=Book+1', 'stream=ndjson', 'stream=json'):
+            with self.subTest(query=query):
+                fast, slow = self.get_both(f'{base}?{query}')
+                self.assertEqual(fast.status_code, status.HTTP_200_OK)
+                self.assertEqual(b''.join(fast) if fast.streaming else fast.content,
+                                 b''.join(slow) if slow.streaming else slow.content)
+
+    def test_cursor_pages_match(self):
+        url = reverse('book-list') + '?ordering=publication_year&page_size=4'
+        while url:
+            fast, slow = self.get_both(url)
+            self.assertEqual(fast.content, slow.content)
+            url = fast.data['next']
+
+    def test_no_model_instances_are_built(self):
+        with mock.patch.object(Book, 'from_db', side_effect=AssertionError('model instantiated')):
+            response = self.client.get(reverse('book-list'), {'ordering': 'title'})
+        self.assertEqual(len(response.data['results']), 30)
+
+
+class BookListResponseCacheTestCase(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = Author.objects.create(name="Terry Pratchett")
+        cls.book = Book.objects.create(title="Mort", publication_year=1987, author=cls.author)
+        Book.objects.create(title="Small Gods", publication_year=1992, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('book-list')
+
+    def test_repeat_queries_skip_the_database(self):
+        self.client.get(self.url, {'search': 'Mort', 'ordering': 'title'})
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url + '?ordering=title&search=%20MORT%20&unused=1')
+        self.assertEqual([book['title'] for book in response.data['results']], ["Mort"])
+
+    def test_no_cache_request_skips_the_cached_copy(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            self.client.get(self.url, headers={'Cache-Control': 'max-age=0, no-cache'})
+
+    def test_case_sensitive_values_get_their_own_entry(self):
+        self.client.get(self.url, {'title': 'Mort'})
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'title': 'MORT'})
+        self.assertEqual(response.data['results'], [])
+
+    def test_book_and_author_writes_invalidate(self):
+        self.client.get(self.url, {'ordering': 'title'})
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.title = "Reaper Man"
+            self.book.save()
+        response = self.client.get(self.url, {'ordering': 'title'})
+        self.assertEqual(response.data['results'][0]['title'], "Reaper Man")
+
+        self.author.name = "Sir Terry Pratchett"
+        self.author.save()
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'ordering': 'title'})
+
+    def test_bulk_create_invalidates(self):
+        self.client.get(self.url)
+        self.client.force_authenticate(User.objects.create_user(username='bulk', password='pass'))
+        self.client.post(reverse('book-bulk'), [{'title': 'Eric', 'publication_year': 1990, 'author': self.author.pk}],
+                         format='json')
+        self.assertEqual(len(self.client.get(self.url).data['results']), 3)
+
+    def test_conditional_get_from_cache(self):
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_entries_expire_and_are_bounded(self):
+        responses = LocalResponseCache(size=2, ttl=60)
+        for key in ('a', 'b', 'c'):
+            responses.set(key, 1, key, {})
+        self.assertIsNone(responses.get('a', 1))
+        self.assertEqual(responses.get('c', 1), ('c', {}))
+        self.assertIsNone(responses.get('c', 2))
+        responses = LocalResponseCache(size=2, ttl=-1)
+        responses.set('a', 1, 'a', {})
+        self.assertIsNone(responses.get('a', 1))
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Plans are read from SQLite EXPLAIN QUERY PLAN')
+class BookListIndexPlanTestCase(APITestCase):
+    """Every filter/ordering BookListView exposes should be answered from an index."""
+
+    # query string -> index the first page must be read through
+    SHAPES = {
+        'ordering=title': 'api_book_title_id_idx',
+        'ordering=-title': 'api_book_title_id_idx',
+        'ordering=publication_year': 'api_book_year_id_idx',
+        'ordering=-publication_year': 'api_book_year_id_idx',
+        'title=Dune': 'api_book_title_id_idx',
+        'title=Dune&ordering=publication_year': 'api_book_title_year_idx',
+        'publication_year=1965': 'api_book_year_id_idx',
+        'publication_year=1965&ordering=-title': 'api_book_year_title_idx',
+        'author__name=Frank+Herbert': 'api_author_name_id_idx',
+        'author__name=Frank+Herbert&ordering=title': 'api_author_name_id_idx',
+        'author__name=Frank+Herbert&ordering=-publication_year': 'api_author_name_id_idx',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name="Frank Herbert")
+        cls.book = Book.objects.create(title="Dune", publication_year=1965, author=author)
+
+    def page_plan(self, url):
+        """EXPLAIN the page query BookListView would run for `url`."""
+        view = BookListView()
+        view.request = Request(APIRequestFactory().get(url))
+        view.args, view.kwargs, view.format_kwarg = (), {}, None
+        queryset = view.filter_queryset(view.get_queryset())
+        return view.paginator, view.paginator.page_queryset(queryset, view.request).explain()
+
+    def assertIndexedPlan(self, plan, query):
+        for line in plan.splitlines():
+            if 'api_book' in line:
+                self.assertRegex(line, r'USING (COVERING )?INDEX|PRIMARY KEY', f'{query}: {plan}')
+        if 'author__name' not in query:
+            # Author names are not unique, so books of several matching
+            # authors still get merged by a sort, bounded by those authors
+            self.assertNotIn('TEMP B-TREE', plan, f'{query}: {plan}')
+
+    def test_default_ordering_reads_primary_key(self):
+        _, plan = self.page_plan('/api/books/')
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_filter_and_ordering_shapes_use_an_index(self):
+        for query, index in self.SHAPES.items():
+            with self.subTest(query=query):
+                paginator, plan = self.page_plan('/api/books/?' + query)
+                self.assertIn(index, plan)
+                self.assertIndexedPlan(plan, query)
+
+                # Following pages seek from the cursor through the same index
+                cursor_url = paginator.encode_cursor(self.book, reverse=False)
+                _, plan = self.page_plan(cursor_url)
+                self.assertIndexedPlan(plan, query)
 
+    def test_author_name_ordering_uses_an_index(self):
+        plan = Author.objects.order_by('name', 'id').explain()
+        self.assertIn('api_author_name_id_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
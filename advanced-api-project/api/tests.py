@@ -1,3 +1,32 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from common.cache import shared_caches
+from common.testing import SqliteTuningTestsMixin
+
+from .models import Author, Book
+
+
+class SqliteTuningTests(SqliteTuningTestsMixin, TestCase):
+    pass
+
+
+class SharedCacheSettingsTests(TestCase):
+
+    def test_workers_never_get_a_per_process_cache(self):
+        with mock.patch('sys.argv', ['manage.py', 'runserver']), mock.patch.dict('os.environ', {}, clear=True):
+            self.assertEqual(shared_caches('site')['default']['BACKEND'], 'django.core.cache.backends.filebased.FileBasedCache')
+        with mock.patch('sys.argv', ['gunicorn']), mock.patch.dict('os.environ', {'REDIS_URL': 'redis://cache:6379/0'}):
+            self.assertEqual(shared_caches('site')['default']['LOCATION'], 'redis://cache:6379/0')
+
+
+class GenerateCatalogTests(TestCase):
+
+    def test_bulk_creates_authors_and_books(self):
+        call_command('generate_catalog', books=250, stdout=StringIO())
+        self.assertEqual(Author.objects.count(), 25)
+        self.assertEqual(Book.objects.count(), 250)
+        self.assertEqual(Book.objects.filter(publication_year__lt=1900).count(), 0)
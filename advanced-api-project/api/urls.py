@@ -4,14 +4,24 @@ from .views import (
     BookDetailView,
     BookCreateView,
     BookUpdateView,
-    BookDeleteView
+    BookDeleteView,
+    BookBulkView,
+    AuthorListView,
+    AuthorDetailView,
+    AsyncBookListView,
+    AsyncBookDetailView,
 )
 
 urlpatterns = [
     path('books/', BookListView.as_view(), name='book-list'),
     path('books/<int:pk>/', BookDetailView.as_view(), name='book-detail'),
+    path('books/async/', AsyncBookListView.as_view(), name='book-list-async'),
+    path('books/async/<int:pk>/', AsyncBookDetailView.as_view(), name='book-detail-async'),
     path('books/create/', BookCreateView.as_view(), name='book-create'),
-    path('books/update/', BookUpdateView.as_view(), name='book-update'),
-path('books/delete/', BookDeleteView.as_view(), name='book-delete'),
+    path('books/update/<int:pk>/', BookUpdateView.as_view(), name='book-update'),
+    path('books/delete/<int:pk>/', BookDeleteView.as_view(), name='book-delete'),
+    path('books/bulk/', BookBulkView.as_view(), name='book-bulk'),
+    path('authors/', AuthorListView.as_view(), name='author-list'),
+    path('authors/<int:pk>/', AuthorDetailView.as_view(), name='author-detail'),
 ]
 
@@ -1,7 +1,21 @@
 from django.shortcuts import render
 from rest_framework import generics, permissions
-from .models import Book
-from .serializers import BookSerializer
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import Prefetch
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from .models import Author, Book, invalidated_in_bulk
+from .serializers import AuthorSerializer, BookSerializer, BookBulkSerializer
+from .pagination import KeysetCursorPagination
+from .streaming import StreamingListMixin
+from .object_cache import CachedRetrieveMixin
+from .conditional import ConditionalResponseMixin, bump_list_version
+from .response_cache import CachedListMixin
+from .projection import SparseFieldsetMixin
+from .fast_serializers import FastListMixin
+from .async_views import AsyncListAPIView, AsyncRetrieveAPIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
@@ -10,7 +24,7 @@ from django_filters import rest_framework
 # Create your views here.
 # Permissions: Read-only access for everyone, but create/update/delete is restricted to authenticated users
 
-class BookListView(generics.ListAPIView):
+class BookListView(CachedListMixin, SparseFieldsetMixin, ConditionalResponseMixin, FastListMixin, StreamingListMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     # Allow read-only access to anyone (no permission classes)
@@ -29,16 +43,36 @@ class BookListView(generics.ListAPIView):
     # Allow ordering by these fields
     ordering_fields = ['title', 'publication_year']
 
-class BookDetailView(generics.RetrieveAPIView):
+    # Keyset pagination on the active ordering (+ id), constant cost per page
+    pagination_class = KeysetCursorPagination
+
+class BookDetailView(SparseFieldsetMixin, ConditionalResponseMixin, CachedRetrieveMixin, generics.RetrieveAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
 
+class AsyncBookListView(SparseFieldsetMixin, AsyncListAPIView):
+    """ASGI-native BookListView: same filters, search, ordering and cursor pages."""
+    queryset = BookListView.queryset
+    serializer_class = BookListView.serializer_class
+    filter_backends = BookListView.filter_backends
+    filterset_fields = BookListView.filterset_fields
+    search_fields = BookListView.search_fields
+    ordering_fields = BookListView.ordering_fields
+    pagination_class = BookListView.pagination_class
+    permission_classes = BookListView.permission_classes
+
+
+class AsyncBookDetailView(SparseFieldsetMixin, AsyncRetrieveAPIView):
+    queryset = BookDetailView.queryset
+    serializer_class = BookDetailView.serializer_class
+    permission_classes = BookDetailView.permission_classes
+
 class BookCreateView(generics.CreateAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-  def perform_create(self, serializer):
+    def perform_create(self, serializer):
         # For example, you can attach the current user here if needed
         serializer.save()
 
@@ -51,3 +85,173 @@ class BookDeleteView(generics.DestroyAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+
+class BookBulkView(generics.GenericAPIView):
+    """
+    Batch create (POST), update (PUT/PATCH) and delete (DELETE) of books.
+
+    The body is a JSON array. Each row is validated on its own, valid rows are
+    written with bulk_create/bulk_update in chunked transactions, and invalid
+    rows are reported back under `errors` with their index.
+    """
+    queryset = Book.objects.all()
+    serializer_class = BookBulkSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    batch_size = 500
+    max_rows = 10000
+
+    def post(self, request, *args, **kwargs):
+        rows = self.get_rows(request)
+        context = self.get_bulk_context(rows)
+        books, errors = [], []
+        for index, row in enumerate(rows):
+            serializer = self.get_serializer(data=row, context=context)
+            if serializer.is_valid():
+                books.append(Book(**serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+
+        created = []
+        for chunk in self.chunked(books):
+            with transaction.atomic():
+                created.extend(Book.objects.bulk_create(chunk))
+                bump_list_version(Book)
+        data = BookSerializer(created, many=True).data
+        return self.bulk_response('created', data, errors, status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=False)
+
+    def patch(self, request, *args, **kwargs):
+        return self.bulk_update(request, partial=True)
+
+    def bulk_update(self, request, partial):
+        rows = self.get_rows(request)
+        context = self.get_bulk_context(rows)
+        ids = [pk for pk in (self.get_row_id(row) for row in rows) if pk is not None]
+        instances = self.get_queryset().in_bulk(ids)
+
+        books, fields, errors = {}, set(), []
+        for index, row in enumerate(rows):
+            pk = self.get_row_id(row)
+            if pk is None:
+                errors.append({'index': index, 'errors': {'id': ['This field is required.']}})
+                continue
+            if pk not in instances:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+                continue
+            serializer = self.get_serializer(instances[pk], data=row, partial=partial, context=context)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            for attr, value in serializer.validated_data.items():
+                setattr(instances[pk], attr, value)
+            fields.update(serializer.validated_data)
+            books[pk] = instances[pk]
+
+        if fields:
+            # bulk_update() skips auto_now and sends no signals, so stamp
+            # updated_at and invalidate cached copies here
+            now = timezone.now()
+            for book in books.values():
+                book.updated_at = now
+            fields.add('updated_at')
+            for chunk in self.chunked(list(books.values())):
+                with transaction.atomic(), invalidated_in_bulk([book.pk for book in chunk]):
+                    Book.objects.bulk_update(chunk, sorted(fields))
+        data = BookSerializer(books.values(), many=True).data
+        return self.bulk_response('updated', data, errors, status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        rows = self.get_rows(request)
+        ids = [self.get_row_id(row) for row in rows]
+        existing = set(self.get_queryset().filter(pk__in=[pk for pk in ids if pk is not None])
+                       .values_list('pk', flat=True))
+
+        deleted, errors = [], []
+        for index, pk in enumerate(ids):
+            if pk is None or pk not in existing:
+                errors.append({'index': index, 'errors': {'id': ['Not found.']}})
+            elif pk not in deleted:
+                deleted.append(pk)
+        for chunk in self.chunked(deleted):
+            with transaction.atomic():
+                self.delete_chunk(chunk)
+        return self.bulk_response('deleted', deleted, errors, status.HTTP_200_OK)
+
+    def delete_chunk(self, pks):
+        # A regular delete, so cascades and signals still run, but the cache
+        # receivers defer to a single invalidation for the chunk
+        with invalidated_in_bulk(pks):
+            Book.objects.filter(pk__in=pks).delete()
+
+    def get_rows(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError({'non_field_errors': ['Expected a list of items.']})
+        if len(request.data) > self.max_rows:
+            raise ValidationError({'non_field_errors': [f'At most {self.max_rows} items per request.']})
+        return request.data
+
+    def get_row_id(self, row):
+        # Rows are either bare ids (DELETE) or objects carrying an `id`
+        pk = row.get('id') if isinstance(row, dict) else row
+        if isinstance(pk, bool):
+            return None
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            return None
+
+    def get_bulk_context(self, rows):
+        # Resolve every referenced author in one query instead of one per row
+        ids = set()
+        for row in rows:
+            if isinstance(row, dict):
+                try:
+                    ids.add(int(row.get('author')))
+                except (TypeError, ValueError):
+                    pass
+        context = self.get_serializer_context()
+        context['authors'] = Author.objects.in_bulk(ids)
+        return context
+
+    def chunked(self, items):
+        for start in range(0, len(items), self.batch_size):
+            yield items[start:start + self.batch_size]
+
+    def bulk_response(self, key, items, errors, success_status):
+        if errors and not items:
+            response_status = status.HTTP_400_BAD_REQUEST
+        elif errors:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = success_status
+        return Response({key: items, 'errors': errors}, status=response_status)
+
+
+class AuthorQuerysetMixin:
+    """
+    Loads authors with their nested books in two queries, whatever the page size.
+    The prefetched books can be narrowed with ?book_year_min= / ?book_year_max=.
+    """
+    serializer_class = AuthorSerializer
+
+    def get_queryset(self):
+        books = Book.objects.all()
+        year_min = self.request.query_params.get('book_year_min')
+        year_max = self.request.query_params.get('book_year_max')
+        if year_min and year_min.isdigit():
+            books = books.filter(publication_year__gte=int(year_min))
+        if year_max and year_max.isdigit():
+            books = books.filter(publication_year__lte=int(year_max))
+        return Author.objects.prefetch_related(Prefetch('books', queryset=books.order_by('id')))
+
+class AuthorListView(AuthorQuerysetMixin, generics.ListAPIView):
+    filter_backends = [filters.SearchFilter, filters.OrderingFilter]
+    search_fields = ['name']
+    ordering_fields = ['name']
+    pagination_class = KeysetCursorPagination
+
+class AuthorDetailView(AuthorQuerysetMixin, generics.RetrieveAPIView):
+    pass
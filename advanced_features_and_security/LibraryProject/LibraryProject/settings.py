@@ -10,11 +10,18 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# `common`, the code shared by the projects in this repository, lives at its root
+sys.path.append(str(BASE_DIR.parent.parent))
+
+from common.cache import shared_caches  # noqa: E402
+from common.database import sqlite_database  # noqa: E402
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -41,14 +48,17 @@ INSTALLED_APPS = [
     'relationship_app',
     'users',
     'csp',
+    'common',
 ]
 
 MIDDLEWARE = [
+    'common.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'relationship_app.roles.UserRoleMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -76,14 +86,26 @@ WSGI_APPLICATION = 'LibraryProject.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite with a busy timeout; `manage.py enable_sqlite_wal` switches the
+# file to WAL mode, see common/database.py
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3'),
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Shared by every worker process, so a fresh worker finds permission
+# bitsets and roles already cached and a revoked permission or changed
+# role reaches all of them. See common/cache.py; set REDIS_URL when
+# workers span hosts.
+CACHES = shared_caches('advanced_features_and_security')
+
+
+# has_perm() answered from a cached per-user permission bitset
+AUTHENTICATION_BACKENDS = ['relationship_app.permissions.CachedPermissionBackend']
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -132,6 +154,7 @@ DEBUG = False  # Ensure this is False in your production environment
 
 # Security Middleware (should already be in MIDDLEWARE)
 MIDDLEWARE = [
+    'common.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # ... other middleware ...
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -167,6 +190,7 @@ SECURE_HSTS_PRELOAD = True  # Allow site to be included in browsers' HSTS preloa
 
 # Important: You must have SecurityMiddleware enabled in MIDDLEWARE:
 MIDDLEWARE = [
+    'common.instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     # ... other middleware ...
 ]
@@ -17,7 +17,11 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from common.instrumentation import query_stats
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('stats/queries/', query_stats, name='query-stats'),
     path('relationship/', include('relationship_app.urls')),
+    path('bookshelf/', include('bookshelf.urls')),
 ]
@@ -4,3 +4,7 @@ class ExampleForm(forms.Form):
     name = forms.CharField(max_length=100, label='Your Name')
     email = forms.EmailField(label='Your Email')
     message = forms.CharField(widget=forms.Textarea, label='Your Message')
+
+
+class BookSearchForm(forms.Form):
+    query = forms.CharField(max_length=100, label='Search books')
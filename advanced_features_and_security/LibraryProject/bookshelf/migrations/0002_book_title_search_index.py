@@ -0,0 +1,36 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+def create_title_index(apps, schema_editor):
+    # Trigram GIN index on Postgres, FTS5 trigram table as the SQLite fallback
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS bookshelf_book_title_trgm ON bookshelf_book USING gin (title gin_trgm_ops)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS bookshelf_book_fts USING fts5(title, tokenize='trigram')"
+        )
+        schema_editor.execute('INSERT INTO bookshelf_book_fts (rowid, title) SELECT id, title FROM bookshelf_book')
+
+
+def drop_title_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS bookshelf_book_title_trgm')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS bookshelf_book_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_title_index, drop_title_index),
+    ]
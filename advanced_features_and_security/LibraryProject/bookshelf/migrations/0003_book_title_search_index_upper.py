@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Django compiles title__icontains / title__istartswith on PostgreSQL to
+# UPPER("title"::text) LIKE UPPER(...), so the trigram index has to be on
+# that expression for the planner to use it.
+UPPER_INDEX = (
+    'CREATE INDEX IF NOT EXISTS bookshelf_book_title_upper_trgm '
+    'ON bookshelf_book USING gin ((UPPER(title::text)) gin_trgm_ops)'
+)
+PLAIN_INDEX = (
+    'CREATE INDEX IF NOT EXISTS bookshelf_book_title_trgm ON bookshelf_book USING gin (title gin_trgm_ops)'
+)
+
+
+def index_upper_title(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS bookshelf_book_title_trgm')
+        schema_editor.execute(UPPER_INDEX)
+
+
+def index_plain_title(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS bookshelf_book_title_upper_trgm')
+        schema_editor.execute(PLAIN_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookshelf', '0002_book_title_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_upper_title, index_plain_title),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .search import index_book, unindex_book
 
 # Create your models here.
 class Book(models.Model):
@@ -70,3 +73,12 @@ class Book(models.Model):
             ("can_edit", "Can edit book"),
             ("can_delete", "Can delete book"),
         ]
+
+
+@receiver(post_save, sender=Book)
+def update_book_search_index(sender, instance, **kwargs):
+    index_book(instance)
+
+@receiver(post_delete, sender=Book)
+def remove_book_search_index(sender, instance, **kwargs):
+    unindex_book(instance.pk)
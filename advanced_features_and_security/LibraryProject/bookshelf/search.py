@@ -0,0 +1,108 @@
+"""
+Indexed title search for bookshelf books.
+
+On PostgreSQL UPPER(title) carries a pg_trgm GIN index. That is the
+expression Django compiles icontains and istartswith to, so the index
+serves both substring and prefix lookups; matches are ranked with
+TrigramSimilarity. On SQLite titles are mirrored into an FTS5 table
+using the trigram tokenizer, kept current by the signal handlers in
+models.py. Other backends fall back to a plain icontains filter.
+"""
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, IntegerField, Value, When
+from django.db.models.functions import Length
+
+FTS_TABLE = 'bookshelf_book_fts'
+# The trigram tokenizer cannot match anything shorter than one trigram
+MIN_TRIGRAM_QUERY = 3
+SEARCH_LIMIT = 50
+AUTOCOMPLETE_LIMIT = 10
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def uses_fts5():
+    return connection.vendor == 'sqlite'
+
+
+def index_book(book):
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [book.pk])
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, title) VALUES (%s, %s)', [book.pk, book.title])
+
+
+def index_book_range(first_pk, last_pk):
+    """Index a pk range in one pass, for bulk_create loads that skip the signals."""
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid BETWEEN %s AND %s', [first_pk, last_pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title) '
+                f'SELECT id, title FROM bookshelf_book WHERE id BETWEEN %s AND %s',
+                [first_pk, last_pk],
+            )
+
+
+def unindex_book(book_id):
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [book_id])
+
+
+def fts5_phrase(query):
+    # A quoted phrase is taken literally, so user input is never FTS5 syntax
+    return '"%s"' % query.replace('"', '""')
+
+
+def _fts5_ids(where, params, limit):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s {where} '
+            f'ORDER BY bm25({FTS_TABLE}), length(title) LIMIT %s',
+            params + [limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _in_order(queryset, ids):
+    if not ids:
+        return queryset.none()
+    ordering = Case(
+        *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ordering)
+
+
+def search_books(queryset, query, limit=SEARCH_LIMIT):
+    """Books whose title contains `query`, closest matches first."""
+    query = query.strip()
+    if not query:
+        return queryset.none()
+    if uses_postgres():
+        return (
+            queryset.filter(title__icontains=query)
+            .annotate(similarity=TrigramSimilarity('title', query))
+            .order_by('-similarity', Length('title'), 'pk')[:limit]
+        )
+    if uses_fts5() and len(query) >= MIN_TRIGRAM_QUERY:
+        return _in_order(queryset, _fts5_ids('', [fts5_phrase(query)], limit))
+    return queryset.filter(title__icontains=query).order_by(Length('title'), 'pk')[:limit]
+
+
+def autocomplete_titles(queryset, prefix, limit=AUTOCOMPLETE_LIMIT):
+    """Books whose title starts with `prefix`, shortest titles first."""
+    prefix = prefix.strip()
+    if not prefix:
+        return queryset.none()
+    if uses_fts5() and len(prefix) >= MIN_TRIGRAM_QUERY:
+        # MATCH narrows to titles containing the prefix via the index,
+        # LIKE then anchors it at the start
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        ids = _fts5_ids("AND title LIKE %s ESCAPE '\\'", [fts5_phrase(prefix), escaped + '%'], limit)
+        return _in_order(queryset, ids)
+    return queryset.filter(title__istartswith=prefix).order_by(Length('title'), 'title', 'pk')[:limit]
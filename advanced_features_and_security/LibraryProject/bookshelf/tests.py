@@ -1,3 +1,54 @@
+import unittest
+
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Book
+from .search import autocomplete_titles, search_books
+
+
+class BookSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.hobbit = Book.objects.create(title='The Hobbit', author='J. R. R. Tolkien')
+        cls.tales = Book.objects.create(title='Hobbit Tales', author='Anon')
+        cls.farm = Book.objects.create(title='Animal Farm', author='George Orwell')
+
+    def test_substring_search_is_ranked(self):
+        self.assertEqual(list(search_books(Book.objects.all(), 'hobbit')), [self.tales, self.hobbit])
+
+    def test_autocomplete_matches_prefix_only(self):
+        self.assertEqual(list(autocomplete_titles(Book.objects.all(), 'hob')), [self.tales])
+        self.assertEqual(list(autocomplete_titles(Book.objects.all(), 'a')), [self.farm])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.farm.title = 'Hobbit Farm'
+        self.farm.save()
+        self.assertIn(self.farm, search_books(Book.objects.all(), 'hobbit'))
+        self.tales.delete()
+        self.assertNotIn(self.tales.pk, [book.pk for book in search_books(Book.objects.all(), 'hobbit')])
+
+    def test_query_syntax_is_literal(self):
+        self.assertEqual(len(search_books(Book.objects.all(), '"hobbit OR')), 0)
+
+    def test_autocomplete_endpoint(self):
+        response = self.client.get(reverse('book_autocomplete'), {'query': 'Anim'})
+        self.assertEqual(response.json(), {'results': [{'id': self.farm.pk, 'title': 'Animal Farm'}]})
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'The trigram index only exists on PostgreSQL')
+class BookSearchIndexPlanTests(TestCase):
+
+    def setUp(self):
+        # A test-sized table is never worth an index scan otherwise
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
 
-# Create your tests here.
+    def test_search_and_autocomplete_use_the_trigram_index(self):
+        for queryset in (
+            search_books(Book.objects.all(), 'hobbit'),
+            autocomplete_titles(Book.objects.all(), 'hob'),
+        ):
+            self.assertIn('bookshelf_book_title_upper_trgm', queryset.explain())
@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('books/', views.book_list, name='book_list'),
+    path('books/search/', views.book_search, name='book_search'),
+    path('books/autocomplete/', views.book_autocomplete, name='book_autocomplete'),
+]
@@ -1,8 +1,10 @@
 from django.shortcuts import render
+from django.http import JsonResponse
 from django.contrib.auth.decorators import permission_required, login_required
 from .models import Book
 from .forms import BookSearchForm
 from .forms import ExampleForm
+from .search import autocomplete_titles, search_books
 
 # Create your views here.
 @login_required
@@ -17,6 +19,15 @@ def book_search(request):
     books = Book.objects.none()
     if form.is_valid():
         query = form.cleaned_data['query']
-        # Use ORM filtering to safely parameterize queries
-        books = Book.objects.filter(title__icontains=query)
+        # Indexed, ranked title search; queries stay parameterized (see search.py)
+        books = search_books(Book.objects.all(), query)
     return render(request, 'bookshelf/book_search.html', {'form': form, 'books': books})
+
+
+def book_autocomplete(request):
+    form = BookSearchForm(request.GET or None)
+    results = []
+    if form.is_valid():
+        books = autocomplete_titles(Book.objects.all(), form.cleaned_data['query'])
+        results = [{'id': book.pk, 'title': book.title} for book in books]
+    return JsonResponse({'results': results})
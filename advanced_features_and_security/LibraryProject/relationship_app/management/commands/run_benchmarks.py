@@ -0,0 +1,90 @@
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from common.cache import isolated_cache
+
+from bookshelf.synthetic import generate_shelf_books
+from relationship_app.benchmarks import compare, report, time_request
+from relationship_app.models import Library
+from relationship_app.synthetic import generate_catalog, scaled_counts
+
+
+def cases():
+    library = Library.objects.order_by('pk').first()
+    library_url = reverse('library_detail', args=[library.pk])
+    return [
+        ('list_books', reverse('list_books')),
+        ('list_books_last_page', reverse('list_books') + '?page=last'),
+        ('library_detail', library_url),
+        ('library_detail_last_page', library_url + '?page=last'),
+        ('book_search', reverse('book_search') + '?query=Garden'),
+        ('book_search_rare', reverse('book_search') + '?query=Golden+Harbor+1'),
+        ('book_autocomplete', reverse('book_autocomplete') + '?query=The+Sil'),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark list_books, LibraryDetailView and the bookshelf title search '
+        'against synthetic catalogs of each --sizes book count, in a throwaway test database, and print '
+        'the results as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1000', help='Comma separated book counts, e.g. 1000,100000,1000000.')
+        parser.add_argument('--rounds', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout.')
+        parser.add_argument('--compare', help='Earlier JSON report to compare mean times against.')
+
+    @isolated_cache()
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options['sizes'].split(','))
+        except ValueError:
+            raise CommandError('--sizes must be a comma separated list of integers.')
+        if any(size < 1 for size in sizes) or options['rounds'] < 1:
+            raise CommandError('Sizes and --rounds must be positive.')
+
+        benchmarks = []
+        # DEBUG off, as in production: no per-query logging overhead
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            for size in sizes:
+                call_command('flush', interactive=False, verbosity=0)
+                counts = generate_catalog(**scaled_counts(size), seed=options['seed'])
+                counts['shelf_books'] = generate_shelf_books(size, seed=options['seed'])
+                client = Client()
+                for name, url in cases():
+                    result = time_request(client, url, options['rounds'], options['warmup'])
+                    benchmarks.append({
+                        'name': name,
+                        'fullname': f'{name}[{size}]',
+                        'group': name,
+                        'params': {'rows': size, 'url': url},
+                        'catalog': counts,
+                        **result,
+                    })
+                    self.stderr.write(f"{name}[{size}]: {result['stats']['mean'] * 1000:.2f} ms, {result['queries']} queries")
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        results = report(benchmarks)
+        if options['compare']:
+            with open(options['compare']) as baseline:
+                results['comparison'] = compare(results, json.load(baseline))
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as out:
+                out.write(output + '\n')
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,132 @@
+"""
+Permission checks served from the shared cache.
+
+CachedPermissionBackend answers has_perm() from a per-user bitset, an int
+with bit N set when the user holds the Permission with pk N, directly or
+through a group. The bitset and the "app_label.codename" -> pk index are
+kept in the default cache, which settings.py shares between every worker
+process (common/cache.py), so a freshly started worker checks permissions
+without touching the database once any worker has loaded them.
+
+Both are stamped with a permission version. Changing a group's
+permissions, or creating, editing or deleting a permission or group,
+bumps the version and so retires every user's bitset at once. Changes to
+one user (their groups, their direct permissions, the user row itself)
+only drop that user's entry. The receivers live in models.py, and both
+invalidations happen twice: straight away, and again once the write
+commits, so a request that read the old rows mid-transaction cannot keep
+them cached under the new version.
+"""
+import time
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import transaction
+
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+PERMISSION_VERSION_KEY = 'relationship_app:perm_version'
+PERMISSION_INDEX_KEY = 'relationship_app:perm_index'
+
+# (version, index) of the last index this process loaded
+_index = (None, {})
+
+
+def user_permissions_key(user_id):
+    return f'relationship_app:perms:{user_id}'
+
+
+def get_permission_version():
+    version = cache.get(PERMISSION_VERSION_KEY)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never reuses an old version
+        cache.add(PERMISSION_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(PERMISSION_VERSION_KEY)
+    return version
+
+
+def bump_permission_version():
+    """Retire every cached bitset and the permission index, now and on commit."""
+    def bump():
+        try:
+            cache.incr(PERMISSION_VERSION_KEY)
+        except ValueError:
+            cache.set(PERMISSION_VERSION_KEY, time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def clear_user_permissions(user_id):
+    key = user_permissions_key(user_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def permission_index(version):
+    """{"app_label.codename": permission pk} for `version`, loaded once per process."""
+    global _index
+    if _index[0] == version:
+        return _index[1]
+    cached = cache.get(PERMISSION_INDEX_KEY)
+    if cached is not None and cached[0] == version:
+        index = cached[1]
+    else:
+        rows = Permission.objects.values_list('content_type__app_label', 'codename', 'pk')
+        index = {f'{app_label}.{codename}': pk for app_label, codename, pk in rows}
+        cache.set(PERMISSION_INDEX_KEY, (version, index), PERMISSION_CACHE_TIMEOUT)
+    _index = (version, index)
+    return index
+
+
+def load_permission_bits(user_id):
+    """Bitset of the user's own and group permissions, in one query."""
+    user_model = get_user_model()
+    via_user = user_model._meta.get_field('user_permissions').related_query_name()
+    via_group = user_model._meta.get_field('groups').related_query_name()
+    permissions = Permission.objects.order_by().values_list('pk', flat=True)
+    pks = permissions.filter(**{via_user: user_id}).union(
+        permissions.filter(**{f'group__{via_group}': user_id})
+    )
+    bits = 0
+    for pk in pks:
+        bits |= 1 << pk
+    return bits
+
+
+def get_permission_bits(user):
+    """
+    (version, bitset) for `user`: kept on the user object for the rest of
+    the request, otherwise read from the cache along with the version in
+    one round trip.
+    """
+    try:
+        return user._permission_bits
+    except AttributeError:
+        pass
+    key = user_permissions_key(user.pk)
+    cached = cache.get_many([PERMISSION_VERSION_KEY, key])
+    version = cached.get(PERMISSION_VERSION_KEY)
+    if version is None:
+        version = get_permission_version()
+    entry = cached.get(key)
+    if entry is None or entry[0] != version:
+        entry = (version, load_permission_bits(user.pk))
+        cache.set(key, entry, PERMISSION_CACHE_TIMEOUT)
+    user._permission_bits = entry
+    return entry
+
+
+class CachedPermissionBackend(ModelBackend):
+    """
+    ModelBackend whose has_perm() is a bit test against the cached bitset.
+    Authentication and the get_*_permissions() helpers are unchanged.
+    """
+
+    def has_perm(self, user_obj, perm, obj=None):
+        if not user_obj.is_active or obj is not None:
+            return False
+        version, bits = get_permission_bits(user_obj)
+        pk = permission_index(version).get(perm)
+        return pk is not None and bool(bits >> pk & 1)
@@ -0,0 +1,67 @@
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.functional import SimpleLazyObject
+
+ROLE_CACHE_TIMEOUT = 60 * 60
+# Cached for users without a profile so they do not hit the database either
+NO_ROLE = ''
+
+
+def role_cache_key(user_id):
+    return f'relationship_app:role:{user_id}'
+
+
+def get_cached_role(user_id):
+    """The user's UserProfile role, from the shared cache when possible."""
+    key = role_cache_key(user_id)
+    role = cache.get(key)
+    if role is None:
+        from .models import UserProfile
+        role = UserProfile.objects.filter(user_id=user_id).values_list('role', flat=True).first() or NO_ROLE
+        cache.set(key, role, ROLE_CACHE_TIMEOUT)
+    return role or None
+
+
+def get_user_role(user):
+    """
+    Role of `user`, or None for anonymous users and users without a profile.
+    Resolved at most once per request: the result is kept on the user object.
+    """
+    if not user.is_authenticated:
+        return None
+    try:
+        return user.role
+    except AttributeError:
+        user.role = get_cached_role(user.pk)
+        return user.role
+
+
+def clear_cached_role(user_id):
+    """
+    Forget the cached role once the profile write commits; the next read
+    loads the committed row. A rolled back write leaves the cache alone.
+    """
+    key = role_cache_key(user_id)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def _attach_role(user):
+    get_user_role(user)
+    return user
+
+
+class UserRoleMiddleware:
+    """
+    Attaches `role` to request.user the first time the user is used, so the
+    role-gated views read it from the cache instead of querying UserProfile.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.user = SimpleLazyObject(partial(_attach_role, request.user))
+        return self.get_response(request)
@@ -0,0 +1,116 @@
+"""
+Synthetic catalogs for load testing and benchmarks.
+
+Everything is written with bulk_create, so model signals do not fire:
+UserProfile rows are created here rather than by the post_save receiver.
+"""
+import random
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from .models import Author, Book, Librarian, Library, UserProfile
+
+BATCH_SIZE = 5000
+ROLES = ['Admin', 'Librarian', 'Member']
+# Relative share of users given each role
+ROLE_WEIGHTS = [1, 9, 90]
+
+
+def scaled_counts(books):
+    """Row counts for a catalog shaped like a real one around `books` books."""
+    return {
+        'authors': max(1, books // 10),
+        'books': books,
+        'libraries': max(1, books // 1000),
+        'books_per_library': min(books, 1000),
+        'users': max(1, books // 100),
+    }
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _bulk(model, objects, batch_size):
+    """bulk_create in chunks, each in its own transaction; yields the saved objects."""
+    for chunk in _chunks(objects, batch_size):
+        with transaction.atomic():
+            created = model.objects.bulk_create(chunk, batch_size=batch_size)
+        yield from created
+
+
+def _count(iterable):
+    return sum(1 for _ in iterable)
+
+
+def generate_catalog(authors, books, libraries, books_per_library, users,
+                     seed=0, batch_size=BATCH_SIZE, prefix='Synthetic'):
+    """
+    Add authors, books, libraries holding `books_per_library` random books
+    each, one librarian per library, and users with profiles. Returns the
+    number of rows created per model.
+    """
+    rng = random.Random(seed)
+    author_ids = [
+        author.pk for author in
+        _bulk(Author, (Author(name=f'{prefix} Author {i}') for i in range(authors)), batch_size)
+    ]
+    book_ids = [
+        book.pk for book in _bulk(
+            Book,
+            (Book(title=f'{prefix} Book {i:07d}', author_id=rng.choice(author_ids)) for i in range(books)),
+            batch_size,
+        )
+    ]
+    library_list = list(_bulk(Library, (Library(name=f'{prefix} Library {i}') for i in range(libraries)), batch_size))
+    per_library = min(books_per_library, len(book_ids))
+    memberships = _count(_bulk(
+        Library.books.through,
+        (
+            Library.books.through(library_id=library.pk, book_id=book_id)
+            for library in library_list
+            for book_id in rng.sample(book_ids, per_library)
+        ),
+        batch_size,
+    ))
+    _count(_bulk(
+        Librarian,
+        (Librarian(name=f'{prefix} Librarian {i}', library=library) for i, library in enumerate(library_list)),
+        batch_size,
+    ))
+
+    User = get_user_model()
+    # Hashing once keeps a million users from costing a million hashes
+    password = make_password(f'{prefix.lower()}-password')
+    # Usernames are unique, so continue numbering after earlier runs
+    first = User.objects.filter(username__startswith=f'{prefix.lower()}_user_').count()
+    user_ids = [
+        user.pk for user in _bulk(
+            User,
+            (User(username=f'{prefix.lower()}_user_{i}', password=password) for i in range(first, first + users)),
+            batch_size,
+        )
+    ]
+    _count(_bulk(
+        UserProfile,
+        (UserProfile(user_id=user_id, role=rng.choices(ROLES, ROLE_WEIGHTS)[0]) for user_id in user_ids),
+        batch_size,
+    ))
+    return {
+        'authors': len(author_ids),
+        'books': len(book_ids),
+        'libraries': len(library_list),
+        'library_books': memberships,
+        'librarians': len(library_list),
+        'users': len(user_ids),
+        'profiles': len(user_ids),
+    }
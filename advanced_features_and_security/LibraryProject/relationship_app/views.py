@@ -11,12 +11,18 @@ from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.decorators import permission_required
 from django.shortcuts import get_object_or_404
 from django.http import HttpResponse
+from django.core.paginator import Paginator
+from .roles import get_user_role
 
 
+BOOKS_PER_PAGE = 50
+
 # Create your views here.
 def list_books(request):
-    books = Book.objects.all()
-    context = {'books': books}
+    # Authors are joined in, so a page is one query plus the paginator's count
+    books = Book.objects.select_related('author').order_by('title', 'pk')
+    page = Paginator(books, BOOKS_PER_PAGE).get_page(request.GET.get('page'))
+    context = {'books': page, 'page_obj': page}
     return render(request, 'relationship_app/list_books.html', context)
 
 class LibraryDetailView(DetailView):
@@ -24,6 +30,16 @@ class LibraryDetailView(DetailView):
     template_name = 'relationship_app/library_detail.html'
     context_object_name = 'library'
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        # Page through the library's books with their authors joined in,
+        # instead of loading the whole collection
+        books = self.object.books.select_related('author').order_by('title', 'pk')
+        page = Paginator(books, BOOKS_PER_PAGE).get_page(self.request.GET.get('page'))
+        context['books'] = page
+        context['page_obj'] = page
+        return context
+
 def register(request):
     if request.method == 'POST':
         form = UserCreationForm(request.POST)
@@ -35,13 +51,13 @@ def register(request):
     return render(request, 'relationship_app/register.html', {'form': form})
 
 def check_admin(user):
-    return user.is_authenticated and user.profile.role == 'Admin'
+    return get_user_role(user) == 'Admin'
 
 def check_librarian(user):
-    return user.is_authenticated and user.profile.role == 'Librarian'
+    return get_user_role(user) == 'Librarian'
 
 def check_member(user):
-    return user.is_authenticated and user.profile.role == 'Member'
+    return get_user_role(user) == 'Member'
 
 @user_passes_test(check_admin)
 def admin_view(request):
@@ -0,0 +1,178 @@
+"""
+ASGI-native read-only views.
+
+DRF views are synchronous, so under ASGI every request is handed to a worker
+thread. These are plain async Django views that reuse the DRF pieces which
+never touch the database (filter backends, serializers, permissions, the JSON
+renderer) and run every query through the async ORM, so a request stays on
+the event loop from start to finish.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured, ValidationError as DjangoValidationError
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.authentication import (
+    SessionAuthentication,
+    TokenAuthentication,
+    get_authorization_header,
+)
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+
+class AsyncAPIView(View):
+    """
+    Authentication, permissions, error handling and rendering for the async
+    views below. Not routable on its own: subclasses define
+    `async def read(self, *args, **kwargs)`, which returns the response data.
+    """
+    queryset = None
+    serializer_class = None
+    filter_backends = api_settings.DEFAULT_FILTER_BACKENDS
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    permission_classes = ()
+    renderer_class = JSONRenderer
+    http_method_names = ['get', 'head', 'options']
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        if not hasattr(cls, 'read'):
+            raise ImproperlyConfigured(f'{cls.__name__} does not define read().')
+        return super().as_view(**initkwargs)
+
+    async def get(self, request, *args, **kwargs):
+        self.request = Request(request, authenticators=[auth() for auth in self.authentication_classes])
+        try:
+            await self.authenticate(self.request)
+            for permission in self.get_permissions():
+                if not permission.has_permission(self.request, self):
+                    self.permission_denied(permission)
+            data = await self.read(*args, **kwargs)
+            status = 200
+        except Exception as exc:
+            data, status, headers = self.handle_exception(exc)
+        else:
+            headers = {}
+        response = HttpResponse(
+            self.renderer_class().render(data),
+            content_type=self.renderer_class.media_type,
+            status=status,
+        )
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    async def authenticate(self, request):
+        """
+        Resolve request.user without leaving the event loop for token and
+        session auth. Any other credentials go through DRF's authenticators
+        in a worker thread so they behave exactly as on the sync views.
+        """
+        auth = get_authorization_header(request).split()
+        for authenticator in request.authenticators:
+            if isinstance(authenticator, TokenAuthentication):
+                if auth and auth[0].lower() == authenticator.keyword.lower().encode() and len(auth) == 2:
+                    user, token = await self.authenticate_token(authenticator, auth[1])
+                    self.set_user(request, user, token, authenticator)
+                    return
+            elif isinstance(authenticator, SessionAuthentication) and not auth:
+                # GET is CSRF-safe, so the session user is all DRF would check
+                user = await request._request.auser()
+                self.set_user(request, user, None, authenticator if user.is_authenticated else None)
+                return
+        await sync_to_async(lambda: request.user)()
+
+    def set_user(self, request, user, auth, authenticator):
+        request._authenticator = authenticator
+        request.user, request.auth = user, auth
+
+    async def authenticate_token(self, authenticator, key):
+        if hasattr(authenticator, 'aauthenticate_credentials'):
+            try:
+                return await authenticator.aauthenticate_credentials(key.decode())
+            except UnicodeError:
+                raise exceptions.AuthenticationFailed('Invalid token.')
+        try:
+            token = await authenticator.get_model().objects.select_related('user').aget(key=key.decode())
+        except (UnicodeError, authenticator.get_model().DoesNotExist):
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed('User inactive or deleted.')
+        return token.user, token
+
+    def get_permissions(self):
+        return [permission() for permission in self.permission_classes]
+
+    def permission_denied(self, permission):
+        if not self.request.successful_authenticator and not self.request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        raise exceptions.PermissionDenied(getattr(permission, 'message', None))
+
+    def handle_exception(self, exc):
+        headers = {}
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            # Same 401/403 choice as APIView.handle_exception
+            authenticators = self.request.authenticators
+            auth_header = authenticators[0].authenticate_header(self.request) if authenticators else None
+            if auth_header:
+                headers['WWW-Authenticate'] = auth_header
+            else:
+                exc.status_code = 403
+        response = exception_handler(exc, {'view': self, 'request': self.request})
+        if response is None:
+            raise exc
+        headers.update((name, value) for name, value in response.items() if name.lower() != 'content-type')
+        return response.data, response.status_code, headers
+
+    def get_queryset(self):
+        return self.queryset.all()
+
+    def filter_queryset(self, queryset):
+        # The configured backends only build the query, they never run it
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(self.request, queryset, self)
+        return queryset
+
+    def get_serializer_class(self):
+        return self.serializer_class
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self}
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.get_serializer_class()(*args, **kwargs)
+
+
+class AsyncListAPIView(AsyncAPIView):
+    pagination_class = None
+    chunk_size = 2000
+
+    async def read(self, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.pagination_class is None:
+            rows = [obj async for obj in queryset.aiterator(chunk_size=self.chunk_size)]
+            return self.get_serializer(rows, many=True).data
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(queryset, self.request, view=self)
+        return paginator.get_paginated_response(self.get_serializer(page, many=True).data).data
+
+
+class AsyncRetrieveAPIView(AsyncAPIView):
+    lookup_field = 'pk'
+    lookup_url_kwarg = None
+
+    async def read(self, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup = {self.lookup_field: kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        try:
+            obj = await queryset.aget(**lookup)
+        except (queryset.model.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404(f'No {queryset.model._meta.object_name} matches the given query.')
+        for permission in self.get_permissions():
+            if not permission.has_object_permission(self.request, self, obj):
+                self.permission_denied(permission)
+        return self.get_serializer(obj).data
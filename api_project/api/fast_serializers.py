@@ -0,0 +1,146 @@
+"""
+Read-only fast path for list serialization.
+
+A ModelSerializer builds a model instance per row and walks every field's
+get_attribute()/to_representation() for it. For plain column fields the
+result is just the column value, so ValuesSerializer compiles a serializer
+into (name, column, converter) triples and renders rows fetched with
+.values_list() directly, producing the same dicts without instantiating
+models. Converters are only kept where DRF actually transforms the value
+(datetimes, for instance); str, int and primary key columns pass through.
+
+Serializers with anything else (method fields, nested serializers, dotted
+sources, custom to_representation) are not compiled, and FastListMixin
+falls back to the regular serializer for them.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# DRF fields whose to_representation() returns database values unchanged
+PASSTHROUGH_FIELDS = (serializers.CharField, serializers.IntegerField)
+# DRF fields that transform the value, through their own to_representation()
+CONVERTED_FIELDS = (
+    serializers.BooleanField,
+    serializers.DateField,
+    serializers.DateTimeField,
+    serializers.DecimalField,
+    serializers.FloatField,
+    serializers.TimeField,
+)
+
+
+def column_converter(field):
+    """
+    How `field` renders its column: None when the value passes through
+    unchanged, a callable when DRF transforms it, False when the field is
+    not a plain column field.
+    """
+    if type(field) in PASSTHROUGH_FIELDS:
+        return None
+    if type(field) is serializers.BigIntegerField:
+        # BigAutoField ids; rendered as strings under COERCE_BIGINT_TO_STRING
+        coerce = getattr(field, 'coerce_to_string', api_settings.COERCE_BIGINT_TO_STRING)
+        return field.to_representation if coerce else None
+    if type(field) is serializers.PrimaryKeyRelatedField:
+        return None if field.pk_field is None else False
+    if type(field) is serializers.DateTimeField:
+        return datetime_converter(field)
+    if type(field) in CONVERTED_FIELDS:
+        return field.to_representation
+    return False
+
+
+def datetime_converter(field):
+    """
+    DateTimeField.to_representation() with the format and timezone looked up
+    once instead of per value. Compiled per request, so the timezone is the
+    one active for it.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.tzinfo is None:
+            return field.to_representation(value)
+        text = value.astimezone(field_timezone).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    return convert
+
+
+class ValuesSerializer:
+    """Renders .values_list() rows the way `serializer` renders model instances."""
+
+    def __init__(self, names, columns, converters):
+        self.names = names
+        self.columns = columns
+        self.converters = converters
+
+    @classmethod
+    def compile(cls, serializer):
+        """A ValuesSerializer equivalent to `serializer`, or None if it has other fields."""
+        if type(serializer).to_representation is not serializers.ModelSerializer.to_representation:
+            return None
+        opts = serializer.Meta.model._meta
+        names, columns, converters = [], [], []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            try:
+                model_field = opts.get_field(field.source)
+            except FieldDoesNotExist:
+                return None
+            converter = column_converter(field)
+            if not model_field.concrete or converter is False:
+                return None
+            names.append(name)
+            columns.append(model_field.name)
+            converters.append(converter)
+        return cls(names, columns, converters)
+
+    def to_representation(self, rows):
+        names = self.names
+        if not any(self.converters):
+            return [dict(zip(names, row)) for row in rows]
+        plan = tuple(zip(names, range(len(names)), self.converters))
+        # Same None check as Serializer.to_representation
+        return [
+            {name: row[i] if convert is None or row[i] is None else convert(row[i]) for name, i, convert in plan}
+            for row in rows
+        ]
+
+
+class FastListMixin:
+    """
+    ListAPIView mixin that serves GET lists through ValuesSerializer. Rows
+    come from .values_list(named=True) with the serializer's columns
+    first, followed by any ordering columns the paginator reads off the
+    last row for its cursor.
+    """
+
+    def get_values_serializer(self):
+        # Compiled per request: the serializer's fields follow ?fields= / ?omit=
+        return ValuesSerializer.compile(self.get_serializer())
+
+    def values_rows(self, queryset, fast):
+        columns = list(fast.columns)
+        paginator = self.paginator
+        if paginator is not None and hasattr(paginator, 'get_ordering'):
+            for field in paginator.get_ordering(queryset):
+                if field.lstrip('-') not in columns:
+                    columns.append(field.lstrip('-'))
+        return queryset.values_list(*columns, named=True)
+
+    def list(self, request, *args, **kwargs):
+        fast = self.get_values_serializer()
+        if fast is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.values_rows(queryset, fast)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.to_representation(page))
+        return Response(fast.to_representation(rows))
@@ -0,0 +1,208 @@
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+import common
+from common.cache import isolated_cache
+
+from api.models import Book
+
+REQUEST_TIMEOUT = 30
+
+
+def seed_books(count):
+    missing = count - Book.objects.count()
+    if missing > 0:
+        Book.objects.bulk_create(
+            (Book(title=f'Benchmark Book {i}', author='Benchmark Author') for i in range(missing)),
+            batch_size=1000,
+        )
+    return max(missing, 0)
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = dict(line.lower().split(': ', 1) for line in lines[1:] if ': ' in line)
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get('connection') != 'close'
+
+
+async def run_client(host, port, request, deadline, stats):
+    writer = None
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            writer.write(request)
+            await writer.drain()
+            status, keep_alive = await asyncio.wait_for(read_response(reader), REQUEST_TIMEOUT)
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ValueError):
+            stats['errors'] += 1
+            if writer is not None:
+                writer.close()
+            writer = None
+            continue
+        stats['latencies'].append(time.monotonic() - started)
+        if status != 200:
+            stats['errors'] += 1
+        if not keep_alive:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def load(host, port, path, clients, duration, headers):
+    """Keep `clients` keep-alive connections busy against `path` for `duration` seconds."""
+    request = (
+        f'GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'
+        + ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+        + '\r\n'
+    ).encode('latin-1')
+    stats = {'latencies': [], 'errors': 0}
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(*(run_client(host, port, request, deadline, stats) for _ in range(clients)))
+    # Requests still in flight at the deadline are waited for, so measure the real span
+    stats['elapsed'] = time.monotonic() - started
+    return stats
+
+
+def summarize(stats):
+    latencies = sorted(stats['latencies'])
+    if not latencies:
+        return {'requests': 0, 'errors': stats['errors']}
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+    return {
+        'requests': len(latencies),
+        'errors': stats['errors'],
+        'elapsed': round(stats['elapsed'], 2),
+        'requests_per_second': round(len(latencies) / stats['elapsed'], 1),
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 2),
+            'p50': percentile(0.50),
+            'p90': percentile(0.90),
+            'p99': percentile(0.99),
+        },
+    }
+
+
+def wait_for_port(host, port, process, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise CommandError('uvicorn exited before it started listening.')
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise CommandError(f'uvicorn did not start listening on {host}:{port}.')
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the BookViewSet list and its ASGI-native twin under uvicorn and '
+        'print requests/second and latency percentiles as JSON. The server runs '
+        'against a throwaway database seeded with --books books.'
+    )
+    sync_path = '/api/books_all/'
+    async_path = '/api/books_all/async/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=1000, help='Concurrent keep-alive connections.')
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds of load per endpoint.')
+        parser.add_argument('--warmup', type=float, default=2.0)
+        parser.add_argument('--books', type=int, default=1000, help='Books to seed the throwaway database with.')
+        parser.add_argument('--query', default='', help='Query string sent to both endpoints, e.g. "ordering=title".')
+        # Both endpoints require an authenticated user
+        parser.add_argument('--user', default='benchmark', help='Send requests with a session for this user.')
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--workers', type=int, default=1)
+
+    @isolated_cache()
+    def handle(self, *args, **options):
+        if importlib.util.find_spec('uvicorn') is None:
+            raise CommandError('uvicorn is required for this benchmark: pip install uvicorn')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == 'sqlite':
+                # A file rather than the usual in-memory test database: the uvicorn workers open it too
+                connection.settings_dict['TEST']['NAME'] = os.path.join(tmp, 'bench.sqlite3')
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                results = self.run_benchmark(options, connection.settings_dict['NAME'])
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if results['sync'].get('requests_per_second') and results['async'].get('requests_per_second'):
+            results['speedup'] = round(results['async']['requests_per_second'] / results['sync']['requests_per_second'], 2)
+        self.stdout.write(json.dumps(results, indent=2))
+
+    def run_benchmark(self, options, database):
+        seed_books(options['books'])
+        headers = {}
+        if options['user']:
+            client = Client()
+            client.force_login(User.objects.create_user(username=options['user']))
+            headers['Cookie'] = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        host, port = options['host'], options['port']
+        query = '?' + options['query'] if options['query'] else ''
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'uvicorn', 'common.bench_asgi:application', '--factory',
+                '--app-dir', str(Path(common.__file__).resolve().parent.parent),
+                '--host', host, '--port', str(port), '--workers', str(options['workers']),
+                '--log-level', 'warning', '--no-access-log',
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'BENCHMARK_DATABASE': str(database)},
+        )
+        results = {
+            'clients': options['clients'],
+            'duration': options['duration'],
+            'workers': options['workers'],
+            'books': Book.objects.count(),
+            'query': options['query'],
+        }
+        try:
+            wait_for_port(host, port, server)
+            for mode, path in (('sync', self.sync_path), ('async', self.async_path)):
+                path += query
+                if options['warmup'] > 0:
+                    asyncio.run(load(host, port, path, min(options['clients'], 50), options['warmup'], headers))
+                stats = asyncio.run(load(host, port, path, options['clients'], options['duration'], headers))
+                results[mode] = dict(path=path, **summarize(stats))
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+        return results
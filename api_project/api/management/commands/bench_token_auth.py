@@ -0,0 +1,92 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from common.cache import isolated_cache
+
+from api.management.commands.bench_async import seed_books
+from api.token_cache import CachedTokenAuthentication, local_tokens
+from api.views import BookList, BookViewSet
+
+AUTHENTICATORS = [('token', TokenAuthentication), ('cached_token', CachedTokenAuthentication)]
+
+
+def measure(client, url, rounds, headers):
+    # Cold caches: the first request pays for the lookup either way
+    cache.clear()
+    local_tokens.clear()
+    with CaptureQueriesContext(connection) as cold:
+        client.get(url, headers=headers)
+    cold_queries = len(cold)
+    with CaptureQueriesContext(connection) as warm:
+        response = client.get(url, headers=headers)
+    warm_queries = len(warm)
+    if response.status_code != 200:
+        raise CommandError(f'GET {url} returned {response.status_code}')
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        client.get(url, headers=headers)
+        timings.append(time.perf_counter() - started)
+    return {
+        'cold_queries': cold_queries,
+        'queries_per_request': warm_queries,
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'requests_per_second': round(len(timings) / sum(timings), 1),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare TokenAuthentication with CachedTokenAuthentication on BookList '
+        'and BookViewSet, in a throwaway test database, and print queries and '
+        'latency per request as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rounds', type=int, default=2000)
+        parser.add_argument('--books', type=int, default=20)
+
+    @isolated_cache()
+    def handle(self, *args, **options):
+        if options['rounds'] < 1:
+            raise CommandError('--rounds must be positive.')
+        views = [BookList, BookViewSet]
+        original = {view: view.authentication_classes for view in views}
+        results = {'rounds': options['rounds'], 'books': options['books']}
+        setup_test_environment(debug=False)
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            seed_books(options['books'])
+            token = Token.objects.create(user=User.objects.create_user(username='machine-client'))
+            headers = {'Authorization': f'Token {token.key}'}
+            client = Client()
+            urls = {'book_list': reverse('book-list'), 'book_viewset_list': reverse('book_all-list')}
+            for name, authenticator in AUTHENTICATORS:
+                for view in views:
+                    view.authentication_classes = [authenticator]
+                results[name] = {
+                    case: measure(client, url, options['rounds'], headers) for case, url in urls.items()
+                }
+        finally:
+            for view, classes in original.items():
+                view.authentication_classes = classes
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        results['queries_saved_per_request'] = {
+            case: results['token'][case]['queries_per_request'] - results['cached_token'][case]['queries_per_request']
+            for case in results['token']
+        }
+        self.stdout.write(json.dumps(results, indent=2))
@@ -1,10 +1,37 @@
+from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .conditional import bump_list_version
+from .object_cache import invalidate
+from .token_cache import forget_token
 
 # Create your models here.
 class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.CharField(max_length=100)
+    # Last write time, used for ETag / Last-Modified validators
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self):
         return f"{self.title} by {self.author}"
 
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_cached_book(sender, instance, **kwargs):
+    invalidate(Book, instance.pk)
+    bump_list_version(Book)
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def revoke_cached_token(sender, instance, **kwargs):
+    forget_token(instance.key)
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def revoke_cached_user_tokens(sender, instance, update_fields=None, **kwargs):
+    # The cached token carries its user, so is_active and friends must not go stale.
+    # Logging in only stamps last_login, which is not worth a query.
+    if update_fields != frozenset(['last_login']):
+        for key in Token.objects.filter(user=instance).values_list('key', flat=True):
+            forget_token(key)
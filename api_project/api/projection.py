@@ -0,0 +1,90 @@
+"""
+Sparse fieldsets: `?fields=id,title` keeps only the named fields of each
+object, `?omit=author` drops fields. The two combine.
+
+The serializer drops the unwanted fields, and on list requests the view
+also narrows the query with .only() to the columns those fields read,
+plus the primary key and the fields of the active ordering. Detail
+requests keep full rows, because the object cache stores whatever
+get_object() loads.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+SAFE_METHODS = ('GET', 'HEAD')
+
+
+def parse_field_list(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+class SparseFieldsetSerializerMixin:
+    """Serializer mixin that keeps only the fields named in context['sparse_fields']."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.context.get('sparse_fields')
+        if selected is not None:
+            for name in list(self.fields):
+                if name not in selected:
+                    self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """View mixin that reads ?fields= / ?omit= and projects the queryset to match."""
+    fields_query_param = 'fields'
+    omit_query_param = 'omit'
+
+    def get_sparse_fields(self):
+        """Selected field names in serializer order, or None when not projecting."""
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = None
+            params = self.request.query_params
+            if self.request.method in SAFE_METHODS and (
+                self.fields_query_param in params or self.omit_query_param in params
+            ):
+                available = list(self.get_serializer_class()().fields)
+                requested = parse_field_list(params.get(self.fields_query_param, '')) or available
+                omitted = parse_field_list(params.get(self.omit_query_param, ''))
+                errors = {}
+                for param, names in ((self.fields_query_param, requested), (self.omit_query_param, omitted)):
+                    unknown = [name for name in names if name not in available]
+                    if unknown:
+                        errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+                if errors:
+                    raise ValidationError(errors)
+                self._sparse_fields = [name for name in available if name in requested and name not in omitted]
+        return self._sparse_fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        selected = self.get_sparse_fields()
+        if selected is not None:
+            context['sparse_fields'] = selected
+        return context
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        selected = self.get_sparse_fields()
+        lookup = getattr(self, 'lookup_url_kwarg', None) or getattr(self, 'lookup_field', None)
+        if selected is None or lookup in self.kwargs:
+            return queryset
+        return queryset.only(*self.projected_columns(queryset, selected))
+
+    def projected_columns(self, queryset, selected):
+        """Model fields read by the selected serializer fields and the ordering."""
+        opts = queryset.model._meta
+        serializer_fields = self.get_serializer_class()().fields
+        names = [serializer_fields[name].source for name in selected]
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        names += [field.lstrip('-') for field in ordering or opts.ordering]
+        columns = [opts.pk.name]
+        for name in names:
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                # Methods, properties and related lookups are not columns
+                continue
+            if field.concrete and field.name not in columns:
+                columns.append(field.name)
+        return columns
@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import Book
+from .projection import SparseFieldsetSerializerMixin
 
-class BookSerializer(serializers.ModelSerializer):
+class BookSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
+    # ?fields= / ?omit= on the book views trim this to the requested fields
     class Meta:
         model = Book
         fields = '__all__'  # Includes all fields in the Book model
@@ -1,3 +1,229 @@
+import base64
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from common.testing import SqliteTuningTestsMixin
+
+from .async_views import AsyncAPIView
+from .fast_serializers import FastListMixin
+from .models import Book
+from .token_cache import local_tokens
+
+
+class BookViewSetCacheTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='testpass123')
+        cls.book = Book.objects.create(title='Hot Book', author='Someone')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('book_all-detail', args=[self.book.pk])
+
+    def test_repeat_retrieves_skip_the_database(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data['title'], 'Hot Book')
+
+    def test_update_invalidates_cached_copy(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(self.url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.client.get(self.url).data['title'], 'Renamed')
+
+
+class BookConditionalGetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='testpass123')
+        cls.book = Book.objects.create(title='Etag Book', author='Someone')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_book_list_not_modified(self):
+        url = reverse('book-list')
+        etag = self.client.get(url)['ETag']
+        # The validators come from the list version, not from a query
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Book.objects.create(title='Another', author='Someone')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_viewset_retrieve_not_modified(self):
+        url = reverse('book_all-detail', args=[self.book.pk])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class AsyncBookViewTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='testpass123')
+        cls.book = Book.objects.create(title='Async Book', author='Someone')
+        Book.objects.create(title='Second Book', author='Someone Else')
+
+    def test_list_matches_viewset(self):
+        self.client.login(username='reader', password='testpass123')
+        sync = self.client.get(reverse('book_all-list'))
+        native = self.client.get(reverse('book_all-async-list'))
+        self.assertEqual(native.status_code, status.HTTP_200_OK)
+        self.assertEqual(native.json(), sync.json())
+
+    def test_base_view_is_not_routable(self):
+        with self.assertRaises(ImproperlyConfigured):
+            AsyncAPIView.as_view()
+
+    def test_retrieve(self):
+        self.client.login(username='reader', password='testpass123')
+        response = self.client.get(reverse('book_all-async-detail', args=[self.book.pk]))
+        self.assertEqual(response.json()['title'], 'Async Book')
+        response = self.client.get(reverse('book_all-async-detail', args=[999999]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_basic_auth_goes_through_drf_authenticators(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'reader:testpass123').decode())
+        self.assertEqual(self.client.get(reverse('book_all-async-list')).status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'reader:wrong').decode())
+        self.assertEqual(
+            self.client.get(reverse('book_all-async-list')).status_code,
+            self.client.get(reverse('book_all-list')).status_code,
+        )
+
+    def test_anonymous_is_rejected_like_viewset(self):
+        sync = self.client.get(reverse('book_all-list'))
+        native = self.client.get(reverse('book_all-async-list'))
+        self.assertEqual(native.status_code, sync.status_code)
+        self.assertEqual(native.json(), sync.json())
+
+
+class BookSparseFieldsetTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='mobile', password='testpass123')
+        cls.book = Book.objects.create(title='Light Book', author='Someone')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_list_projection_reaches_the_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('book-list'), {'fields': 'id,title'})
+        self.assertEqual(response.json(), [{'id': self.book.pk, 'title': 'Light Book'}])
+        self.assertNotIn('"api_book"."author"', queries[-1]['sql'])
+
+    def test_viewset_and_async_views(self):
+        response = self.client.get(reverse('book_all-list'), {'omit': 'updated_at,author'})
+        self.assertEqual(response.json(), [{'id': self.book.pk, 'title': 'Light Book'}])
+        response = self.client.get(reverse('book_all-detail', args=[self.book.pk]), {'fields': 'author'})
+        self.assertEqual(response.json(), {'author': 'Someone'})
+        self.client.login(username='mobile', password='testpass123')
+        response = self.client.get(reverse('book_all-async-list'), {'fields': 'title'})
+        self.assertEqual(response.json(), [{'title': 'Light Book'}])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get(reverse('book_all-list'), {'omit': 'isbn'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_writes_ignore_projection(self):
+        url = reverse('book_all-list') + '?fields=id'
+        response = self.client.post(url, {'title': 'New', 'author': 'Writer'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['title'], 'New')
+
+
+class BookFastListTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='lister', password='testpass123')
+        Book.objects.bulk_create(Book(title=f'Book {i}', author=f'Author {i % 4}') for i in range(20))
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_output_is_byte_identical(self):
+        for params in ({}, {'fields': 'id,updated_at'}, {'omit': 'title'}):
+            with self.subTest(params=params):
+                fast = self.client.get(reverse('book-list'), params)
+                cache.clear()
+                with mock.patch.object(FastListMixin, 'get_values_serializer', return_value=None):
+                    slow = self.client.get(reverse('book-list'), params)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_no_model_instances_are_built(self):
+        with mock.patch.object(Book, 'from_db', side_effect=AssertionError('model instantiated')):
+            response = self.client.get(reverse('book-list'))
+        self.assertEqual(len(response.json()), 20)
+
+
+class CachedTokenAuthenticationTests(APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='machine', password='testpass123')
+        Book.objects.create(title='Token Book', author='Someone')
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        self.token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def test_repeat_requests_skip_the_token_query(self):
+        url = reverse('book-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        # Only the list itself; the token comes from the cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        # A worker that has not seen the token yet reads the shared cache
+        local_tokens.clear()
+        with self.assertNumQueries(1):
+            self.client.get(url)
+
+    def test_deleted_token_is_rejected(self):
+        url = reverse('book_all-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.token.delete()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(reverse('book_all-async-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        url = reverse('book_all-async-list')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(self.client.get(reverse('book-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + '0' * 40)
+        self.assertEqual(self.client.get(reverse('book-list')).status_code, status.HTTP_401_UNAUTHORIZED)
+
 
-# Create your tests here.
+class SqliteTuningTests(SqliteTuningTestsMixin, TestCase):
+    pass
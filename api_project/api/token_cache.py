@@ -0,0 +1,167 @@
+"""
+Token authentication without a database query per request.
+
+DRF's TokenAuthentication looks up Token joined to User on every call.
+CachedTokenAuthentication answers from two layers instead:
+
+- a bounded LRU dict in this process, whose entries live for
+  LOCAL_TOKEN_TTL seconds, and
+- the default cache, for TOKEN_CACHE_TIMEOUT seconds. settings.py shares
+  it between every worker (common/cache.py).
+
+Only a miss in both runs the Token + User query. Entries are keyed by a
+hash of the token, so raw tokens never appear in cache keys.
+
+Deleting a token, or saving or deleting its user, drops the entry from
+the shared cache and from this process's LRU (receivers in models.py).
+Other processes forget their local copy within LOCAL_TOKEN_TTL, which
+bounds how long a revoked token keeps working there. That bound needs the
+second layer to be shared: with a per-process cache, a revoked token
+would keep working on other workers for up to TOKEN_CACHE_TIMEOUT.
+"""
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+TOKEN_CACHE_TIMEOUT = 60 * 5
+LOCAL_TOKEN_TTL = 10
+LOCAL_TOKEN_CACHE_SIZE = 1000
+
+
+def token_cache_key(key):
+    return 'authtoken:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+class LocalTokenCache:
+    """Thread-safe LRU of pickled tokens, each expiring after `ttl` seconds."""
+
+    def __init__(self, size=LOCAL_TOKEN_CACHE_SIZE, ttl=LOCAL_TOKEN_TTL):
+        self.size = size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, cache_key):
+        with self.lock:
+            entry = self.entries.get(cache_key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[cache_key]
+                return None
+            self.entries.move_to_end(cache_key)
+            return entry[1]
+
+    def set(self, cache_key, payload):
+        with self.lock:
+            self.entries[cache_key] = (time.monotonic() + self.ttl, payload)
+            self.entries.move_to_end(cache_key)
+            while len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, cache_key):
+        with self.lock:
+            self.entries.pop(cache_key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_tokens = LocalTokenCache()
+
+
+def _load_token(key):
+    try:
+        return Token.objects.select_related('user').get(key=key)
+    except Token.DoesNotExist:
+        return None
+
+
+def _cached_payload(cache_key):
+    payload = local_tokens.get(cache_key)
+    if payload is None:
+        payload = cache.get(cache_key)
+        if payload is not None:
+            local_tokens.set(cache_key, payload)
+    return payload
+
+
+def _store(cache_key, token):
+    # Pickled once, so every hit unpickles a private copy of token and user
+    payload = pickle.dumps(token)
+    cache.set(cache_key, payload, TOKEN_CACHE_TIMEOUT)
+    local_tokens.set(cache_key, payload)
+
+
+def get_token(key):
+    """The Token for `key` with its user, or None if there is no such token."""
+    cache_key = token_cache_key(key)
+    payload = _cached_payload(cache_key)
+    if payload is not None:
+        return pickle.loads(payload)
+    token = _load_token(key)
+    if token is not None:
+        _store(cache_key, token)
+    return token
+
+
+async def aget_token(key):
+    cache_key = token_cache_key(key)
+    payload = local_tokens.get(cache_key)
+    if payload is None:
+        payload = await cache.aget(cache_key)
+        if payload is not None:
+            local_tokens.set(cache_key, payload)
+    if payload is not None:
+        return pickle.loads(payload)
+    try:
+        token = await Token.objects.select_related('user').aget(key=key)
+    except Token.DoesNotExist:
+        return None
+    payload = pickle.dumps(token)
+    await cache.aset(cache_key, payload, TOKEN_CACHE_TIMEOUT)
+    local_tokens.set(cache_key, payload)
+    return token
+
+
+def forget_token(key):
+    """
+    Drop a token from both layers now, so the revoking request already sees
+    it gone, and again on commit, so a reader that loaded the row before
+    the delete committed cannot leave it cached.
+    """
+    cache_key = token_cache_key(key)
+
+    def drop():
+        cache.delete(cache_key)
+        local_tokens.delete(cache_key)
+
+    drop()
+    transaction.on_commit(drop)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication served from the local and shared token caches."""
+
+    def authenticate_credentials(self, key):
+        return self.check_token(get_token(key))
+
+    async def aauthenticate_credentials(self, key):
+        return self.check_token(await aget_token(key))
+
+    def check_token(self, token):
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        return token.user, token
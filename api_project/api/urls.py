@@ -1,7 +1,7 @@
 from django.urls import path, include
 from .views import BookList
 from rest_framework.routers import DefaultRouter
-from .views import BookViewSet, BookList
+from .views import BookViewSet, BookList, AsyncBookList, AsyncBookDetail
 from rest_framework.authtoken.views import obtain_auth_token
 
 router = DefaultRouter()
@@ -10,6 +10,9 @@ router.register(r'books_all', BookViewSet, basename='book_all')
 urlpatterns = [
     path('books/', BookList.as_view(), name='book-list'),
     path('auth/token/', obtain_auth_token, name='api_token_auth'),
+    # Ahead of the router, which would read 'async' as a book pk
+    path('books_all/async/', AsyncBookList.as_view(), name='book_all-async-list'),
+    path('books_all/async/<int:pk>/', AsyncBookDetail.as_view(), name='book_all-async-detail'),
     path('', include(router.urls)),
 ]
 
@@ -2,18 +2,41 @@ from django.shortcuts import render
 from rest_framework import generics, viewsets
 from .models import Book
 from .serializers import BookSerializer
+from .object_cache import CachedRetrieveMixin
+from .conditional import ConditionalResponseMixin
+from .projection import SparseFieldsetMixin
+from .fast_serializers import FastListMixin
+from .async_views import AsyncListAPIView, AsyncRetrieveAPIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 # Create your views here.
-class BookList(generics.ListAPIView):
+class BookList(SparseFieldsetMixin, ConditionalResponseMixin, FastListMixin, generics.ListAPIView):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
 
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(SparseFieldsetMixin, ConditionalResponseMixin, CachedRetrieveMixin, viewsets.ModelViewSet):
     """
     Handles listing, creating, retrieving, updating, and deleting Book objects.
+    Retrieval is served from the shared object cache (see object_cache.py).
     """
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
+
+
+class AsyncBookViewSetMixin(SparseFieldsetMixin):
+    """ASGI-native read paths of BookViewSet, with the same auth and permissions."""
+    queryset = BookViewSet.queryset
+    serializer_class = BookViewSet.serializer_class
+    authentication_classes = BookViewSet.authentication_classes
+    permission_classes = BookViewSet.permission_classes
+    filter_backends = BookViewSet.filter_backends
+
+
+class AsyncBookList(AsyncBookViewSetMixin, AsyncListAPIView):
+    pass
+
+
+class AsyncBookDetail(AsyncBookViewSetMixin, AsyncRetrieveAPIView):
+    pass
@@ -0,0 +1,7 @@
+"""
+Code shared by the Django projects in this repository.
+
+Each project's settings.py puts the repository root on sys.path. The
+SQLite projects also list `common` in INSTALLED_APPS, which makes the
+management commands here available to their manage.py.
+"""
@@ -0,0 +1,23 @@
+"""
+ASGI application for benchmarks that serve a throwaway database.
+
+A benchmark that load-tests the project under uvicorn creates its database
+in a file, then starts
+
+    uvicorn common.bench_asgi:application --factory --app-dir <repository root>
+
+with BENCHMARK_DATABASE naming that file. The workers then read it instead
+of the project's own database, and use a local-memory cache so they neither
+see nor touch the entries cached for the real one.
+"""
+import os
+
+
+def application():
+    from django.conf import settings
+
+    settings.DATABASES['default']['NAME'] = os.environ['BENCHMARK_DATABASE']
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+    from django.core.asgi import get_asgi_application
+    return get_asgi_application()
@@ -0,0 +1,51 @@
+"""
+The default cache, shared by every worker process of a project.
+
+List versions, the object cache, token and permission caches all tell the
+other workers about a write through this cache, so it cannot be Django's
+per-process local-memory default: a worker that did not handle the write
+would never see it. shared_caches() picks
+
+* Redis, when REDIS_URL is set (Django's backend, needs the `redis`
+  package); required once workers run on more than one host.
+* Otherwise a file-based cache in the temp directory, shared by every
+  process on this host: runserver, or gunicorn on a single machine.
+* The local-memory cache under `manage.py test`. A test run is one
+  process, and a file cache would carry entries into the next run.
+"""
+import os
+import sys
+import tempfile
+
+# Versions are seeded from the clock, so an entry culled at this size only
+# costs a refetch
+FILE_CACHE_MAX_ENTRIES = 10000
+
+
+def shared_caches(name):
+    """A CACHES setting for the project `name`, which also namespaces its file cache."""
+    if os.environ.get('REDIS_URL'):
+        default = {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+            'KEY_PREFIX': name,
+        }
+    elif sys.argv[1:2] == ['test']:
+        default = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    else:
+        default = {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.path.join(tempfile.gettempdir(), f'{name}-cache'),
+            'OPTIONS': {'MAX_ENTRIES': FILE_CACHE_MAX_ENTRIES},
+        }
+    return {'default': default}
+
+
+def isolated_cache():
+    """
+    override_settings() with an empty local-memory cache, for the benchmark
+    commands: they run against a throwaway database and must neither read
+    the entries cached for the real one nor clear them.
+    """
+    from django.test.utils import override_settings
+    return override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+PER_PROCESS_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register('caches', deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Version keys only reach other workers through a shared default cache; see common/cache.py."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PER_PROCESS_BACKENDS:
+        return []
+    return [Warning(
+        f"The default cache ({backend}) is not shared between worker processes.",
+        hint='Cache invalidation only reaches the worker that made the write. Use common.cache.shared_caches().',
+        id='common.W001',
+    )]
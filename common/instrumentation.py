@@ -0,0 +1,252 @@
+"""
+Per-request SQL instrumentation.
+
+QueryInstrumentationMiddleware times every request and, through a database
+execute wrapper, counts its queries, their total time and how often the
+same statement ran more than once (the N+1 signature: one query per row of
+a list). A summary of each request is kept in a bounded in-memory ring
+buffer that the staff-only query_stats view returns as JSON. With
+SERVER_TIMING on, responses also carry a Server-Timing header
+
+    Server-Timing: db;dur=4.21;desc="12 queries", dup;desc="10 duplicates", total;dur=9.87
+
+It exposes query counts and timings to any client, so it is off unless
+DEBUG is.
+
+A streaming response runs its queries while the body is iterated, after
+the middleware has returned. Those queries are still attributed to the
+request and counted in its ring buffer entry, which is written once the
+stream is exhausted; its Server-Timing header, sent before the body, only
+covers the queries run by the view itself.
+
+Statements are compared with their placeholders, before parameters are
+bound, so `SELECT ... WHERE id = %s` run for 50 different ids counts as 49
+duplicates.
+
+Settings:
+    SERVER_TIMING               send the Server-Timing header (default DEBUG)
+    QUERY_STATS_BUFFER_SIZE     requests kept per process (default 500)
+    QUERY_STATS_DUPLICATE_WARN  log a warning at this many duplicates (default 10)
+"""
+import logging
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+SQL_PREVIEW_LENGTH = 300
+TOP_DUPLICATES = 3
+
+_current = ContextVar('query_stats', default=None)
+_buffer_lock = threading.Lock()
+_buffer = None
+
+
+class RequestQueryStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+
+    def record(self, sql, duration):
+        self.queries += 1
+        self.db_time += duration
+        self.statements[sql] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values())
+
+    def top_duplicates(self):
+        return [
+            {'sql': sql[:SQL_PREVIEW_LENGTH], 'count': count}
+            for sql, count in self.statements.most_common(TOP_DUPLICATES)
+            if count > 1
+        ]
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper shared by every connection; a no-op outside a request."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, time.perf_counter() - started)
+
+
+def install_wrapper(connection):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@receiver(connection_created, dispatch_uid='query_instrumentation')
+def instrument_new_connection(sender, connection, **kwargs):
+    # Covers connections opened in worker threads, e.g. by the async ORM
+    install_wrapper(connection)
+
+
+def get_buffer():
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = deque(maxlen=getattr(settings, 'QUERY_STATS_BUFFER_SIZE', 500))
+    return _buffer
+
+
+def clear_stats():
+    get_buffer().clear()
+
+
+class QueryInstrumentationMiddleware:
+    """Put first in MIDDLEWARE so the total covers every other middleware."""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.duplicate_warning = getattr(settings, 'QUERY_STATS_DUPLICATE_WARN', 10)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        for connection in connections.all(initialized_only=True):
+            install_wrapper(connection)
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats)
+
+    async def __acall__(self, request):
+        stats = RequestQueryStats()
+        token = _current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, stats)
+
+    def finish(self, request, response, stats):
+        if getattr(settings, 'SERVER_TIMING', settings.DEBUG):
+            response['Server-Timing'] = (
+                f'db;dur={stats.db_time * 1000:.2f};desc="{stats.queries} queries", '
+                f'dup;desc="{stats.duplicates} duplicates", '
+                f'total;dur={(time.perf_counter() - stats.started) * 1000:.2f}'
+            )
+        if not response.streaming:
+            self.record(request, response, stats)
+        elif response.is_async:
+            response.streaming_content = self.astream(response.streaming_content, request, response, stats)
+        else:
+            response.streaming_content = self.stream(response.streaming_content, request, response, stats)
+        return response
+
+    def stream(self, content, request, response, stats):
+        """Iterate `content` with `stats` current, then record the request."""
+        iterator = iter(content)
+        try:
+            while True:
+                token = _current.set(stats)
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    _current.reset(token)
+                yield chunk
+        finally:
+            self.record(request, response, stats)
+
+    async def astream(self, content, request, response, stats):
+        iterator = aiter(content)
+        try:
+            while True:
+                token = _current.set(stats)
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+                finally:
+                    _current.reset(token)
+                yield chunk
+        finally:
+            self.record(request, response, stats)
+
+    def record(self, request, response, stats):
+        total = time.perf_counter() - stats.started
+        duplicates = stats.duplicates
+        match = getattr(request, 'resolver_match', None)
+        entry = {
+            'time': time.time(),
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'queries': stats.queries,
+            'duplicates': duplicates,
+            'db_ms': round(stats.db_time * 1000, 3),
+            'total_ms': round(total * 1000, 3),
+            'top_duplicates': stats.top_duplicates(),
+        }
+        get_buffer().append(entry)
+        if self.duplicate_warning and duplicates >= self.duplicate_warning:
+            logger.warning(
+                '%s %s ran %d duplicate queries (%d total), likely N+1: %s',
+                request.method, request.path, duplicates, stats.queries,
+                entry['top_duplicates'][0]['sql'] if entry['top_duplicates'] else '',
+            )
+
+
+def summarize(entries):
+    """Per-view aggregates over a list of ring buffer entries."""
+    by_view = {}
+    for entry in entries:
+        by_view.setdefault(entry['view'] or entry['path'], []).append(entry)
+    summary = {}
+    for view, rows in by_view.items():
+        totals = sorted(row['total_ms'] for row in rows)
+        summary[view] = {
+            'requests': len(rows),
+            'avg_queries': round(statistics.fmean(row['queries'] for row in rows), 2),
+            'max_queries': max(row['queries'] for row in rows),
+            'max_duplicates': max(row['duplicates'] for row in rows),
+            'avg_db_ms': round(statistics.fmean(row['db_ms'] for row in rows), 3),
+            'p50_total_ms': totals[len(totals) // 2],
+            'p95_total_ms': totals[min(len(totals) - 1, int(len(totals) * 0.95))],
+        }
+    return summary
+
+
+@staff_member_required
+def query_stats(request):
+    """Recent requests from this process's ring buffer, newest first, plus per-view aggregates."""
+    entries = list(get_buffer())
+    try:
+        limit = max(0, int(request.GET.get('limit', 50)))
+    except ValueError:
+        limit = 50
+    return JsonResponse({
+        'buffered': len(entries),
+        'views': summarize(entries),
+        'recent': entries[::-1][:limit],
+    })
@@ -0,0 +1,86 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from common.database import BUSY_TIMEOUT_MS, SQLITE_PRAGMAS, WAL_PRAGMAS, apply_pragmas
+
+TUNED_PRAGMAS = {'journal_mode': 'WAL', **SQLITE_PRAGMAS, **WAL_PRAGMAS}
+
+
+def worker(path, pragmas, begin, role, deadline, results):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000 if pragmas else 5.0, isolation_level=None)
+    if pragmas:
+        apply_pragmas(conn, pragmas)
+    done = locked = 0
+    while time.monotonic() < deadline:
+        try:
+            if role == 'reader':
+                conn.execute('SELECT count(*), max(counter) FROM bench').fetchone()
+            else:
+                # Read-then-write, like a Django save() inside atomic()
+                conn.execute(begin)
+                row = conn.execute('SELECT max(counter) FROM bench').fetchone()
+                conn.execute('INSERT INTO bench (counter, payload) VALUES (?, ?)', ((row[0] or 0) + 1, 'x' * 200))
+                conn.execute('COMMIT')
+            done += 1
+        except sqlite3.OperationalError as exc:
+            if 'locked' not in str(exc) and 'busy' not in str(exc):
+                raise
+            locked += 1
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+    conn.close()
+    results.append((role, done, locked))
+
+
+def benchmark(readers, writers, duration):
+    """Parallel readers and writers against a scratch database, default vs tuned."""
+    report = {'readers': readers, 'writers': writers, 'duration': duration}
+    for mode, pragmas, begin in (('default', None, 'BEGIN'), ('wal', TUNED_PRAGMAS, 'BEGIN IMMEDIATE')):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'bench.sqlite3')
+            with sqlite3.connect(path) as conn:
+                conn.execute('CREATE TABLE bench (id INTEGER PRIMARY KEY, counter INTEGER, payload TEXT)')
+            results = []
+            deadline = time.monotonic() + duration
+            threads = [
+                threading.Thread(target=worker, args=(path, pragmas, begin, role, deadline, results))
+                for role in ['reader'] * readers + ['writer'] * writers
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        totals = {}
+        for role, done, locked in results:
+            counts = totals.setdefault(role, {'ops': 0, 'locked_errors': 0})
+            counts['ops'] += done
+            counts['locked_errors'] += locked
+        for counts in totals.values():
+            counts['ops_per_second'] = round(counts['ops'] / duration, 1)
+        report[mode] = totals
+    return report
+
+
+class Command(BaseCommand):
+    help = (
+        'Run parallel SQLite readers and writers against a scratch database, '
+        'first with the default configuration and then in WAL mode with the '
+        'pragmas from common/database.py, and print throughput and lock errors as JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per configuration.')
+
+    def handle(self, *args, **options):
+        if options['readers'] < 0 or options['writers'] < 0 or options['duration'] <= 0:
+            raise CommandError('--readers and --writers must not be negative, --duration must be positive.')
+        report = benchmark(options['readers'], options['writers'], options['duration'])
+        self.stdout.write(json.dumps(report, indent=2))
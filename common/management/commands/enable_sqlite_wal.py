@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from common.database import enable_wal
+
+
+class Command(BaseCommand):
+    help = (
+        'Switch the SQLite database file to write-ahead logging. The mode is '
+        'stored in the file, so this only needs to run once per database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"{options['database']} is not an SQLite database.")
+        with connection.cursor() as cursor:
+            mode = enable_wal(cursor)
+        if mode != 'wal':
+            # In-memory databases, for one, cannot use WAL
+            raise CommandError(f'SQLite kept journal_mode={mode}.')
+        self.stdout.write(self.style.SUCCESS(f"{connection.settings_dict['NAME']} now uses WAL."))
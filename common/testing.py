@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.utils import ConnectionHandler
+
+from .database import enable_wal, journal_mode, sqlite_database
+
+
+class SqliteTuningTestsMixin:
+    """
+    The checks for database.py. Each SQLite project mixes this into a
+    TestCase so they run against its own DATABASES entry, named by `database`.
+    """
+    database = DEFAULT_DB_ALIAS
+
+    def project_pragmas(self):
+        return connections[self.database].settings_dict['PRAGMAS']
+
+    def test_pragmas_applied_on_connect(self):
+        with connections[self.database].cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], self.project_pragmas()['busy_timeout'])
+
+    def test_wal_is_switched_on_once_and_kept_by_the_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            databases = {'default': sqlite_database(os.path.join(tmp, 'wal.sqlite3'), **self.project_pragmas())}
+            handler = ConnectionHandler(databases)
+            try:
+                with handler['default'].cursor() as cursor:
+                    # Connecting alone leaves the file's journal mode alone
+                    self.assertEqual(journal_mode(cursor), 'delete')
+                    self.assertEqual(enable_wal(cursor), 'wal')
+            finally:
+                handler.close_all()
+            handler = ConnectionHandler(databases)
+            try:
+                with handler['default'].cursor() as cursor:
+                    self.assertEqual(journal_mode(cursor), 'wal')
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            finally:
+                handler.close_all()
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def invalidate_migrated_permissions(sender, **kwargs):
+    from .permissions import bump_permission_version
+    bump_permission_version()
 
 
 class RelationshipAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'relationship_app'
+
+    def ready(self):
+        # migrate bulk creates new permissions without post_save. Connected
+        # here, after django.contrib.auth's ready(), so it runs after them.
+        post_migrate.connect(invalidate_migrated_permissions)
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from relationship_app.synthetic import BATCH_SIZE, generate_catalog, scaled_counts
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-create a synthetic catalog: authors, books, libraries with their '
+        'books, librarians, and users with profiles. Counts not given are '
+        'scaled from --books.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--books', type=int, default=1000)
+        parser.add_argument('--authors', type=int)
+        parser.add_argument('--libraries', type=int)
+        parser.add_argument('--books-per-library', type=int)
+        parser.add_argument('--users', type=int)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--prefix', default='Synthetic')
+
+    def handle(self, *args, **options):
+        if options['books'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--books and --batch-size must be positive.')
+        counts = scaled_counts(options['books'])
+        for name in counts:
+            if options.get(name) is not None:
+                counts[name] = options[name]
+        created = generate_catalog(
+            **counts, seed=options['seed'], batch_size=options['batch_size'], prefix=options['prefix'],
+        )
+        summary = ', '.join(f'{count} {name}' for name, count in created.items())
+        self.stdout.write(self.style.SUCCESS(f'Created {summary}.'))
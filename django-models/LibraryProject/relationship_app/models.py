@@ -1,7 +1,11 @@
 from django.db import models
-from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission, User
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
+from .permissions import bump_permission_version, clear_user_permissions
+from .roles import clear_cached_role
 
 # Create your models here.
 class Author(models.Model):
@@ -13,7 +17,8 @@ class Author(models.Model):
 class Book(models.Model):
     title = models.CharField(max_length=200)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
-     class Meta:
+
+    class Meta:
         permissions = [
             ('can_add_book', 'Can add book'),
             ('can_change_book', 'Can change book'),
@@ -50,3 +55,44 @@ class UserProfile(models.Model):
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def uncache_user_role(sender, instance, **kwargs):
+    clear_cached_role(instance.user_id)
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+@receiver(post_delete, sender=Group)
+def invalidate_all_permissions(sender, **kwargs):
+    bump_permission_version()
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    # A group's permissions reach all of its users, so retire every bitset
+    if action.startswith('post_'):
+        bump_permission_version()
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_permissions(sender, instance, **kwargs):
+    # Logging in only stamps last_login, which has no bearing on permissions
+    if kwargs.get('update_fields') != frozenset(['last_login']):
+        clear_user_permissions(instance.pk)
+
+@receiver(m2m_changed)
+def invalidate_user_permission_links(sender, instance, action, reverse, pk_set, **kwargs):
+    user_model = get_user_model()
+    if sender not in (user_model.groups.through, user_model.user_permissions.through):
+        return
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        clear_user_permissions(instance.pk)
+    elif pk_set:
+        # group.user_set.add(...) and friends name the users in pk_set
+        for user_id in pk_set:
+            clear_user_permissions(user_id)
+    else:
+        # Clearing from the group/permission side does not say who was affected
+        bump_permission_version()
@@ -1,3 +1,172 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from common.testing import SqliteTuningTestsMixin
+
+from . import permissions
+from .models import Author, Book, Librarian, Library, UserProfile
+from .roles import get_cached_role
+
+
+class RoleViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(username='admin', password='testpass123')
+        UserProfile.objects.filter(user=cls.admin).update(role='Admin')
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='admin', password='testpass123')
+
+    def test_role_check_costs_no_queries_once_cached(self):
+        self.assertEqual(get_cached_role(self.admin.pk), 'Admin')
+        # Session and user lookups only; the role comes from the cache
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('admin_view'))
+        self.assertEqual(response.status_code, 200)
+
+    def test_profile_save_invalidates_cached_role(self):
+        self.assertEqual(self.client.get(reverse('admin_view')).status_code, 200)
+        profile = self.admin.profile
+        profile.role = 'Member'
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.assertEqual(self.client.get(reverse('admin_view')).status_code, 302)
+        self.assertEqual(self.client.get(reverse('member_view')).status_code, 200)
+
+    def test_rolled_back_role_is_not_cached(self):
+        profile = self.admin.profile
+        profile.role = 'Member'
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.save()
+        self.assertEqual(self.client.get(reverse('member_view')).status_code, 200)
+        with self.assertRaises(DatabaseError):
+            with transaction.atomic():
+                profile.role = 'Admin'
+                profile.save()
+                raise DatabaseError('rolled back')
+        self.assertEqual(self.client.get(reverse('admin_view')).status_code, 302)
+
+    def test_missing_profile_is_denied_not_an_error(self):
+        UserProfile.objects.filter(user=self.admin).delete()
+        self.assertEqual(self.client.get(reverse('admin_view')).status_code, 302)
+        self.assertEqual(self.client.get(reverse('member_view')).status_code, 302)
+
+
+class CachedPermissionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.editor = User.objects.create_user(username='editor', password='testpass123')
+        cls.editors = Group.objects.create(name='Editors')
+        cls.can_add = Permission.objects.get(codename='can_add_book')
+        cls.editors.permissions.add(cls.can_add)
+        cls.editor.groups.add(cls.editors)
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='editor', password='testpass123')
+
+    def assertCanAdd(self, allowed):
+        response = self.client.get(reverse('add_book'))
+        self.assertEqual(response.status_code, 200 if allowed else 302)
+
+    def test_check_costs_no_queries_once_cached(self):
+        self.assertCanAdd(True)
+        # A restarted worker: nothing in process memory, only the shared cache
+        permissions._index = (None, {})
+        # Session and user lookups only; the permission comes from the cache
+        with self.assertNumQueries(2):
+            self.assertCanAdd(True)
+
+    def test_group_membership_change_is_seen(self):
+        self.assertCanAdd(True)
+        self.editor.groups.remove(self.editors)
+        self.assertCanAdd(False)
+        self.editors.user_set.add(self.editor)
+        self.assertCanAdd(True)
+
+    def test_group_permission_change_is_seen(self):
+        self.assertCanAdd(True)
+        self.editors.permissions.remove(self.can_add)
+        self.assertCanAdd(False)
+        self.editor.user_permissions.add(self.can_add)
+        self.assertCanAdd(True)
+
+    def test_bits_read_before_commit_do_not_survive_it(self):
+        self.assertCanAdd(True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.editors.permissions.remove(self.can_add)
+            # A concurrent request that still saw the old rows caches them
+            # under the version the remove just bumped to
+            stale_bits = 1 << self.can_add.pk
+            cache.set(permissions.user_permissions_key(self.editor.pk),
+                      (permissions.get_permission_version(), stale_bits))
+        self.assertCanAdd(False)
+
+    def test_unknown_permission_is_denied(self):
+        user = User.objects.get(pk=self.editor.pk)
+        self.assertFalse(user.has_perm('relationship_app.no_such_permission'))
+        self.assertTrue(user.has_perm('relationship_app.can_add_book'))
+
+
+class BookListingQueryCountTests(TestCase):
+
+    def create_books(self, count):
+        authors = Author.objects.bulk_create(Author(name=f'Author {i}') for i in range(count))
+        return Book.objects.bulk_create(Book(title=f'Book {i:05d}', author=author) for i, author in enumerate(authors))
+
+    @override_settings(SERVER_TIMING=True)
+    def test_list_books_query_count_is_constant(self):
+        for count in (5, 120):
+            Book.objects.all().delete()
+            self.create_books(count)
+            # Paginator count plus one page of books joined with authors
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('list_books'))
+            self.assertEqual(len(response.context['books']), min(count, 50))
+            self.assertContains(response, 'by Author 0')
+            self.assertIn('desc="2 queries", dup;desc="0 duplicates"', response['Server-Timing'])
+
+    def test_library_detail_query_count_is_constant(self):
+        library = Library.objects.create(name='Central')
+        for count in (5, 120):
+            library.books.set(self.create_books(count))
+            # Library, paginator count, one page of books with authors
+            with self.assertNumQueries(3):
+                response = self.client.get(reverse('library_detail', args=[library.pk]))
+            self.assertEqual(len(response.context['books']), min(count, 50))
+
+    def test_library_detail_pages(self):
+        library = Library.objects.create(name='Central')
+        library.books.set(self.create_books(60))
+        response = self.client.get(reverse('library_detail', args=[library.pk]), {'page': 2})
+        self.assertEqual([book.title for book in response.context['books']][:1], ['Book 00050'])
+
+
+class SqliteTuningTests(SqliteTuningTestsMixin, TestCase):
+    pass
+
+
+class GenerateCatalogTests(TestCase):
+
+    def test_generates_every_model_in_bulk(self):
+        call_command('generate_catalog', books=200, libraries=3, books_per_library=40, users=25, stdout=StringIO())
+        self.assertEqual(Book.objects.count(), 200)
+        self.assertEqual(Author.objects.count(), 20)
+        self.assertEqual(Librarian.objects.count(), 3)
+        self.assertEqual(Library.books.through.objects.count(), 120)
+        self.assertEqual(User.objects.count(), 25)
+        self.assertEqual(UserProfile.objects.count(), 25)
+
+    def test_repeat_runs_add_more_users(self):
+        call_command('generate_catalog', books=10, users=5, stdout=StringIO())
+        call_command('generate_catalog', books=10, users=5, stdout=StringIO())
+        self.assertEqual(User.objects.count(), 10)
@@ -2,7 +2,6 @@ from django.urls import path
 from . import views
 from .views import list_books
 from django.contrib.auth import views as auth_views
-from .views import RegisterView
 from .views import add_book, edit_book, delete_book
 
 urlpatterns = [
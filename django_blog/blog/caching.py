@@ -0,0 +1,40 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+POST_LIST_VERSION_KEY = 'blog:post_list_version'
+POST_LIST_CACHE_TIMEOUT = 300
+TAG_CLOUD_CACHE_KEY = 'blog:tag_cloud'
+TAG_CLOUD_CACHE_TIMEOUT = 600
+
+
+def get_post_list_version():
+    """Current generation of the cached post list fragments."""
+    version = cache.get(POST_LIST_VERSION_KEY)
+    if version is None:
+        # Seed with a timestamp so an evicted counter never reuses an old generation
+        cache.add(POST_LIST_VERSION_KEY, time.time_ns(), None)
+        version = cache.get(POST_LIST_VERSION_KEY)
+    return version
+
+
+def bump_post_list_version():
+    """
+    Invalidate every cached post list page at once: straight away, so the
+    writing request already sees it, and again on commit, so a page rendered
+    from the old rows before the commit is not cached under the new version.
+    """
+    def bump():
+        try:
+            cache.incr(POST_LIST_VERSION_KEY)
+        except ValueError:
+            cache.set(POST_LIST_VERSION_KEY, time.time_ns(), None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def invalidate_tag_cloud():
+    """Drop the cached tag cloud; the next request rebuilds it from TagStat."""
+    cache.delete(TAG_CLOUD_CACHE_KEY)
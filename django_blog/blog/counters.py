@@ -0,0 +1,58 @@
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def comment_stats_expressions(comment_model):
+    """
+    UPDATE expressions that recompute Post.comment_count and
+    Post.last_commented_at from the comments table.
+    """
+    comments = comment_model.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    return {
+        'comment_count': Coalesce(
+            Subquery(comments.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+            Value(0),
+        ),
+        'last_commented_at': Subquery(comments.annotate(latest=Max('updated_at')).values('latest')),
+    }
+
+
+def reconcile_comment_stats(post_model, comment_model, chunk_size=10000):
+    """Rewrite the comment stats of every post, one primary-key range at a time."""
+    expressions = comment_stats_expressions(comment_model)
+    posts = post_model.objects.order_by('pk').values_list('pk', flat=True)
+    updated = 0
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return updated
+        updated += post_model.objects.filter(pk__gte=chunk[0], pk__lte=chunk[-1]).update(**expressions)
+        last_pk = chunk[-1]
+
+
+def reconcile_tag_stats(tag_stat_model, tagged_item_model, content_type, batch_size=5000):
+    """
+    Rebuild the per-tag post counts with a single GROUP BY over the tagged
+    items of `content_type`.
+    """
+    counts = (
+        tagged_item_model.objects.filter(content_type=content_type)
+        .order_by().values('tag').annotate(total=Count('pk'))
+    )
+    with transaction.atomic():
+        tag_stat_model.objects.all().delete()
+        stats = tag_stat_model.objects.bulk_create(
+            (tag_stat_model(tag_id=row['tag'], post_count=row['total']) for row in counts),
+            batch_size=batch_size,
+        )
+    return len(stats)
+
+
+def popular_tags(tag_stat_model, limit):
+    """The `limit` most used tags as name/slug/count dicts, in name order."""
+    stats = tag_stat_model.objects.filter(post_count__gt=0).order_by('-post_count', 'tag')
+    rows = stats.values('tag__name', 'tag__slug', 'post_count')[:limit]
+    tags = [{'name': row['tag__name'], 'slug': row['tag__slug'], 'count': row['post_count']} for row in rows]
+    return sorted(tags, key=lambda tag: tag['name'].lower())
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from blog.models import Post
+from blog.search import index_post
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search entries for every blog post.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = 0
+        posts = Post.objects.prefetch_related('tags').order_by('pk')
+        for post in posts.iterator(chunk_size=options['chunk_size']):
+            index_post(post)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} posts.'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from blog.caching import bump_post_list_version
+from blog.counters import reconcile_comment_stats
+from blog.models import Comment, Post
+
+
+class Command(BaseCommand):
+    help = 'Recompute comment_count and last_commented_at for every blog post.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        updated = reconcile_comment_stats(Post, Comment, chunk_size=options['chunk_size'])
+        bump_post_list_version()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled comment stats for {updated} posts.'))
@@ -0,0 +1,16 @@
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from taggit.models import TaggedItem
+
+from blog.caching import invalidate_tag_cloud
+from blog.counters import reconcile_tag_stats
+from blog.models import Post, TagStat
+
+
+class Command(BaseCommand):
+    help = 'Recompute the post count of every tag used on blog posts.'
+
+    def handle(self, *args, **options):
+        tags = reconcile_tag_stats(TagStat, TaggedItem, ContentType.objects.get_for_model(Post))
+        invalidate_tag_cloud()
+        self.stdout.write(self.style.SUCCESS(f'Reconciled post counts for {tags} tags.'))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:12
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# Space separated tag names of the blog_post row in the outer query
+POST_TAGS = (
+    "(SELECT {aggregate} FROM taggit_taggeditem ti "
+    "JOIN taggit_tag t ON t.id = ti.tag_id "
+    "JOIN django_content_type ct ON ct.id = ti.content_type_id "
+    "WHERE ct.app_label = 'blog' AND ct.model = 'post' AND ti.object_id = blog_post.id)"
+)
+
+
+def create_search_index(apps, schema_editor):
+    # GIN index on Postgres, FTS5 table as the SQLite development fallback,
+    # both filled from the existing posts in one statement, the same text
+    # index_post() writes
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        tags = POST_TAGS.format(aggregate="string_agg(t.name, ' ')")
+        schema_editor.execute(
+            "UPDATE blog_post SET search_vector = "
+            "setweight(to_tsvector(COALESCE(title, '')), 'A') || "
+            f"setweight(to_tsvector(COALESCE({tags}, '')), 'B') || "
+            "setweight(to_tsvector(COALESCE(content, '')), 'C')"
+        )
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS blog_post_search_vector_gin ON blog_post USING gin (search_vector)'
+        )
+    elif vendor == 'sqlite':
+        tags = POST_TAGS.format(aggregate="group_concat(t.name, ' ')")
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5(title, tags, content)'
+        )
+        schema_editor.execute(
+            'INSERT INTO blog_post_fts (rowid, title, tags, content) '
+            f"SELECT id, title, COALESCE({tags}, ''), content FROM blog_post"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS blog_post_search_vector_gin')
+    elif vendor == 'sqlite':
+        schema_editor.execute('DROP TABLE IF EXISTS blog_post_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_post_tags_comment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:12
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+BACKFILL_CHUNK_SIZE = 10000
+
+
+def backfill_comment_stats(apps, schema_editor):
+    # Kept self-contained: blog.counters may change after this migration
+    Post = apps.get_model('blog', 'Post')
+    Comment = apps.get_model('blog', 'Comment')
+    comments = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+    stats = {
+        'comment_count': Coalesce(
+            Subquery(comments.annotate(total=Count('pk')).values('total'), output_field=IntegerField()),
+            Value(0),
+        ),
+        'last_commented_at': Subquery(comments.annotate(latest=Max('updated_at')).values('latest')),
+    }
+    posts = Post.objects.order_by('pk').values_list('pk', flat=True)
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:BACKFILL_CHUNK_SIZE])
+        if not chunk:
+            return
+        Post.objects.filter(pk__gte=chunk[0], pk__lte=chunk[-1]).update(**stats)
+        last_pk = chunk[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_comment_post_created_idx'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='last_commented_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['last_commented_at'], name='blog_post_last_commented_idx'),
+        ),
+        migrations.RunPython(backfill_comment_stats, migrations.RunPython.noop),
+    ]
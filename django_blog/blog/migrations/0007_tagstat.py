@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_tag_stats(apps, schema_editor):
+    # Kept self-contained: blog.counters may change after this migration
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    TagStat = apps.get_model('blog', 'TagStat')
+    TaggedItem = apps.get_model('taggit', 'TaggedItem')
+    post_type = ContentType.objects.filter(app_label='blog', model='post').first()
+    if post_type is None:
+        return
+    counts = TaggedItem.objects.filter(content_type=post_type).order_by().values('tag').annotate(total=Count('pk'))
+    TagStat.objects.bulk_create(
+        (TagStat(tag_id=row['tag'], post_count=row['total']) for row in counts),
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_updated_at'),
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TagStat',
+            fields=[
+                ('tag', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_stat', serialize=False, to='taggit.tag')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-post_count', 'tag'], name='blog_tagstat_count_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_tag_stats, migrations.RunPython.noop),
+    ]
@@ -1,14 +1,37 @@
 from django.db import models
+from django.db.models import F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
 from taggit.managers import TaggableManager
+from django.contrib.contenttypes.models import ContentType
+from taggit.models import Tag, TaggedItem
+from .search import index_post, unindex_post
+from .caching import bump_post_list_version, invalidate_tag_cloud
 
 # Create your models here.
 class Post(models.Model):
     title = models.CharField(max_length=200)
     content = models.TextField()
     published_date = models.DateTimeField(auto_now_add=True)
+    # Last edit to the post itself or its tags, used for ETag / Last-Modified
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posts')
     tags = TaggableManager()
+    # Weighted title/tags/content vector, maintained by the signals below (Postgres only)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Denormalized comment stats, kept in step by the Comment signals below
+    # and repaired in bulk by `manage.py reconcile_comment_counters`
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_commented_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['last_commented_at'], name='blog_post_last_commented_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -20,5 +43,111 @@ class Comment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Serves "comments of this post, newest first" (-created_at, -pk) without a sort
+            models.Index(fields=['post', 'created_at', 'id'], name='blog_comment_post_created_idx'),
+        ]
+
     def __str__(self):
         return f'Comment by {self.author} on {self.post}'
+
+class TagStat(models.Model):
+    """
+    Materialized number of posts per tag, so the tag cloud never has to
+    GROUP BY the generic TaggedItem table. Kept in step by the TaggedItem
+    signals below and rebuilt by `manage.py reconcile_tag_counts`.
+    """
+    tag = models.OneToOneField(Tag, on_delete=models.CASCADE, primary_key=True, related_name='post_stat')
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Serves "most used tags first" for the tag cloud without a sort
+            models.Index(fields=['-post_count', 'tag'], name='blog_tagstat_count_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.tag}: {self.post_count}'
+
+
+@receiver(post_save, sender=Post)
+def update_post_search_index(sender, instance, **kwargs):
+    index_post(instance)
+
+@receiver(m2m_changed, sender=TaggedItem)
+def update_post_search_index_tags(sender, instance, action, **kwargs):
+    if isinstance(instance, Post) and action in ('post_add', 'post_remove', 'post_clear'):
+        index_post(instance)
+
+@receiver(post_delete, sender=Post)
+def remove_post_search_index(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_list_cache(sender, **kwargs):
+    bump_post_list_version()
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_post_list_cache_tag_names(sender, **kwargs):
+    # Pages show tag names and link to their slugs
+    bump_post_list_version()
+
+@receiver(post_save, sender=User)
+def invalidate_post_list_cache_usernames(sender, update_fields=None, **kwargs):
+    # Pages show each post's author; logins only touch last_login
+    if update_fields is None or 'username' in update_fields:
+        bump_post_list_version()
+
+@receiver(m2m_changed, sender=TaggedItem)
+def invalidate_post_list_cache_tags(sender, instance, action, **kwargs):
+    if isinstance(instance, Post) and action in ('post_add', 'post_remove', 'post_clear'):
+        bump_post_list_version()
+        # Tags render on the detail page, so they count as an edit
+        Post.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+
+@receiver(post_save, sender=Comment)
+def update_post_comment_stats(sender, instance, created, **kwargs):
+    # Single UPDATE with F() so concurrent comments never lose a count
+    activity = Greatest(Coalesce(F('last_commented_at'), Value(instance.updated_at)), Value(instance.updated_at))
+    changes = {'last_commented_at': activity}
+    if created:
+        changes['comment_count'] = F('comment_count') + 1
+    Post.objects.filter(pk=instance.post_id).update(**changes)
+    bump_post_list_version()
+
+@receiver(post_delete, sender=Comment)
+def remove_post_comment_stats(sender, instance, origin=None, **kwargs):
+    # Deleting a post cascades to its comments; their stats go with the post
+    if isinstance(origin, Post) or (isinstance(origin, models.QuerySet) and origin.model is Post):
+        return
+    latest = Comment.objects.filter(post=OuterRef('pk')).values('post').annotate(latest=Max('updated_at')).values('latest')
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=Greatest(F('comment_count') - 1, Value(0)),
+        last_commented_at=Subquery(latest),
+    )
+    bump_post_list_version()
+
+def is_post_tag(tagged_item):
+    return tagged_item.content_type_id == ContentType.objects.get_for_model(Post).pk
+
+@receiver(post_save, sender=TaggedItem)
+def count_post_tag(sender, instance, created, **kwargs):
+    # Every way of tagging a post (tags.add/set, admin) saves a TaggedItem
+    if created and is_post_tag(instance):
+        stats = TagStat.objects.filter(tag_id=instance.tag_id)
+        # First use of a tag creates its row; a racing creator loses to the UPDATE
+        if not stats.update(post_count=F('post_count') + 1):
+            _, new_stat = TagStat.objects.get_or_create(tag_id=instance.tag_id, defaults={'post_count': 1})
+            if not new_stat:
+                stats.update(post_count=F('post_count') + 1)
+        invalidate_tag_cloud()
+
+@receiver(post_delete, sender=TaggedItem)
+def uncount_post_tag(sender, instance, **kwargs):
+    # tags.remove/clear and deleting a post all delete TaggedItem rows
+    if is_post_tag(instance):
+        TagStat.objects.filter(tag_id=instance.tag_id).update(post_count=Greatest(F('post_count') - 1, Value(0)))
+        invalidate_tag_cloud()
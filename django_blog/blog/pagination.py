@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+from django.db.models import Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class KeysetPage:
+    """
+    One page of rows, newest first, starting after a (timestamp, pk) cursor.
+    `field` names the datetime column to order on. The query only runs when
+    the page is first iterated, so a cached template fragment that never
+    touches it costs no database work.
+    """
+
+    def __init__(self, queryset, size, cursor=None, field='published_date'):
+        self.size = size
+        self.cursor = cursor
+        self.field = field
+        queryset = queryset.order_by('-' + field, '-pk')
+        if cursor:
+            timestamp, pk = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{field + '__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk})
+            )
+        self.queryset = queryset
+
+    @cached_property
+    def rows(self):
+        # One extra row tells us whether there is a next page
+        return list(self.queryset[:self.size + 1])
+
+    def __iter__(self):
+        return iter(self.rows[:self.size])
+
+    def __len__(self):
+        return len(self.rows[:self.size])
+
+    @property
+    def has_next(self):
+        return len(self.rows) > self.size
+
+    @property
+    def next_cursor(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.rows[self.size - 1])
+
+    def encode_cursor(self, obj):
+        micros = (getattr(obj, self.field) - EPOCH) // timedelta(microseconds=1)
+        return f'{micros}-{obj.pk}'
+
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            micros, pk = cursor.split('-')
+            return EPOCH + timedelta(microseconds=int(micros)), int(pk)
+        except (ValueError, OverflowError):
+            raise Http404('Invalid cursor.')
+
+
+class KeysetPaginationMixin:
+    """
+    ListView mixin that replaces the full object list with a KeysetPage.
+    `?sort=` picks one of `sort_fields`; rows with no value for that field
+    are left out of the page.
+    """
+    page_size = 20
+    cursor_param = 'after'
+    sort_fields = {'recent': 'published_date'}
+    default_sort = 'recent'
+
+    def get_sort(self):
+        sort = self.request.GET.get('sort', self.default_sort)
+        return sort if sort in self.sort_fields else self.default_sort
+
+    def get_context_data(self, **kwargs):
+        queryset = kwargs.pop('object_list', self.object_list)
+        sort = self.get_sort()
+        field = self.sort_fields[sort]
+        page = KeysetPage(
+            queryset.filter(**{field + '__isnull': False}),
+            self.page_size,
+            self.request.GET.get(self.cursor_param),
+            field=field,
+        )
+        context = super().get_context_data(object_list=page, **kwargs)
+        context['page'] = page
+        context['sort'] = sort
+        return context
@@ -0,0 +1,94 @@
+"""
+Full-text search for blog posts.
+
+On PostgreSQL each post keeps a weighted `search_vector` (title > tags >
+content) backed by a GIN index and results are ranked with SearchRank.
+On SQLite the same text is mirrored into an FTS5 table ranked with bm25.
+Both are kept current by the signal handlers in models.py.
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+
+FTS_TABLE = 'blog_post_fts'
+# Upper bound on ranked matches pulled out of the SQLite FTS table
+FTS_RESULT_LIMIT = 1000
+
+
+def uses_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def uses_fts5():
+    return connection.vendor == 'sqlite'
+
+
+def index_post(post):
+    """Refresh the search entry for one post from its current title, content and tags."""
+    tags = ' '.join(tag.name for tag in post.tags.all())
+    if uses_postgres():
+        vector = (
+            SearchVector('title', weight='A')
+            + SearchVector(Value(tags), weight='B')
+            + SearchVector('content', weight='C')
+        )
+        type(post).objects.filter(pk=post.pk).update(search_vector=vector)
+    elif uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post.pk])
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} (rowid, title, tags, content) VALUES (%s, %s, %s, %s)',
+                [post.pk, post.title, tags, post.content],
+            )
+
+
+def unindex_post(post_id):
+    if uses_fts5():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [post_id])
+
+
+def fts5_match_expression(query):
+    # Quote every word so user input can never be parsed as FTS5 syntax;
+    # the last word is matched as a prefix for search-as-you-type.
+    words = re.findall(r'\w+', query)
+    if not words:
+        return None
+    terms = ['"%s"' % word for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_posts(queryset, query):
+    """Filter `queryset` to posts matching `query`, best matches first."""
+    if uses_postgres():
+        search_query = SearchQuery(query, search_type='websearch')
+        return (
+            queryset.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(F('search_vector'), search_query))
+            .order_by('-rank', '-published_date')
+        )
+    if uses_fts5():
+        match = fts5_match_expression(query)
+        if match is None:
+            return queryset.none()
+        with connection.cursor() as cursor:
+            # Column weights follow the Postgres A/B/C weighting
+            cursor.execute(
+                f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s '
+                f'ORDER BY bm25({FTS_TABLE}, 10.0, 4.0, 1.0) LIMIT %s',
+                [match, FTS_RESULT_LIMIT],
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        if not ids:
+            return queryset.none()
+        ordering = Case(
+            *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(ordering)
+    return queryset.filter(
+        Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__name__icontains=query)
+    ).distinct()
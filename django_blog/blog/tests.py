@@ -1,3 +1,370 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from django_blog.database import database_settings
+from common.instrumentation import RequestQueryStats, clear_stats
+
+from .caching import bump_post_list_version, get_post_list_version
+from .models import Comment, Post, TagStat
+from .search import search_posts
+
+
+class PostSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='writer', password='testpass123')
+        cls.django_post = Post.objects.create(
+            title='Django tips', content='Working with the ORM.', author=cls.user)
+        cls.orm_post = Post.objects.create(
+            title='Query tuning', content='Django querysets and indexes.', author=cls.user)
+        cls.other_post = Post.objects.create(
+            title='Gardening', content='Tomatoes in spring.', author=cls.user)
+        cls.other_post.tags.add('python')
+
+    def test_title_matches_rank_first(self):
+        results = list(search_posts(Post.objects.all(), 'django'))
+        self.assertEqual(results, [self.django_post, self.orm_post])
+
+    def test_tags_are_searchable(self):
+        self.assertEqual(list(search_posts(Post.objects.all(), 'python')), [self.other_post])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.other_post.title = 'Django in the garden'
+        self.other_post.save()
+        self.assertIn(self.other_post, search_posts(Post.objects.all(), 'django'))
+        self.other_post.delete()
+        self.assertEqual(len(search_posts(Post.objects.all(), 'garden')), 0)
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(len(search_posts(Post.objects.all(), '"* OR NEAR(')), 0)
+
+    def test_post_list_search(self):
+        response = self.client.get(reverse('post_list'), {'q': 'tomatoes'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['posts']), [self.other_post])
+
+
+class PostListPaginationCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='author', password='testpass123')
+        cls.posts = [
+            Post.objects.create(title=f'Post {i}', content='Body', author=cls.user)
+            for i in range(25)
+        ]
+        cls.posts[0].tags.add('news')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_pages_walk_newest_first(self):
+        expected = list(Post.objects.order_by('-published_date', '-pk'))
+        response = self.client.get(reverse('post-list'))
+        page = response.context['page']
+        self.assertEqual(list(page), expected[:20])
+        response = self.client.get(reverse('post-list'), {'after': page.next_cursor})
+        self.assertEqual(list(response.context['page']), expected[20:])
+        self.assertFalse(response.context['page'].has_next)
+
+    def test_invalid_cursor_is_404(self):
+        response = self.client.get(reverse('post-list'), {'after': 'nope'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_is_two_queries_then_served_from_cache(self):
+        # The page of posts with authors, then the tags of the whole page
+        with self.assertNumQueries(2):
+            first = self.client.get(reverse('post-list'))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('post-list'))
+        self.assertEqual(first.content, second.content)
+
+    def test_saving_a_post_invalidates_cached_pages(self):
+        self.client.get(reverse('post-list'))
+        post = self.posts[-1]
+        post.title = 'Fresh title'
+        post.save()
+        self.assertContains(self.client.get(reverse('post-list')), 'Fresh title')
+
+    def test_renaming_a_tag_or_author_invalidates_cached_pages(self):
+        self.client.get(reverse('post-list'))
+        self.client.get(reverse('post_tag', args=['news']))
+        tag = self.posts[0].tags.get()
+        tag.name = 'headlines'
+        tag.save()
+        self.assertContains(self.client.get(reverse('post_tag', args=['news'])), 'headlines')
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertContains(self.client.get(reverse('post-list')), 'By renamed')
+
+    def test_version_is_bumped_again_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            bump_post_list_version()
+        before = get_post_list_version()
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_post_list_version(), before)
+
+    def test_posts_by_tag(self):
+        response = self.client.get(reverse('post_tag', args=['news']))
+        self.assertEqual(list(response.context['posts']), [self.posts[0]])
+
+
+class PostDetailCommentTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='reader', password='testpass123')
+        cls.post = Post.objects.create(title='Busy post', content='Body', author=cls.user)
+        cls.post.tags.add('django', 'performance')
+        commenters = [User.objects.create_user(username=f'commenter{i}') for i in range(5)]
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=commenters[i % 5], content=f'Comment {i}')
+            for i in range(60)
+        )
+
+    def test_detail_query_count_is_bounded(self):
+        # Post with author, its tags, one window of comments with authors
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-detail', args=[self.post.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['comments']), 50)
+        self.assertContains(response, 'commenter1')
+
+    def test_conditional_get(self):
+        url = reverse('post-detail', args=[self.post.pk])
+        self.client.cookies['csrftoken'] = 'x' * 32
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Comment.objects.create(post=self.post, author=self.user, content='Fresh')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        etag = self.client.get(url)['ETag']
+        self.post.tags.add('new-tag')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_no_validators_without_csrf_cookie(self):
+        response = self.client.get(reverse('post-detail', args=[self.post.pk]))
+        self.assertNotIn('ETag', response)
+
+    def test_older_comments_window(self):
+        response = self.client.get(reverse('post-detail', args=[self.post.pk]))
+        cursor = response.context['comments'].next_cursor
+        response = self.client.get(reverse('post-detail', args=[self.post.pk]), {'comments_after': cursor})
+        self.assertEqual(len(response.context['comments']), 10)
+        self.assertFalse(response.context['comments'].has_next)
+
+
+class CommentCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='talker', password='testpass123')
+        cls.quiet = Post.objects.create(title='Quiet post', content='Body', author=cls.user)
+        cls.busy = Post.objects.create(title='Busy post', content='Body', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client.login(username='talker', password='testpass123')
+
+    def test_comment_views_maintain_counters(self):
+        self.client.post(reverse('comment-create', args=[self.busy.pk]), {'content': 'First'})
+        self.client.post(reverse('comment-create', args=[self.busy.pk]), {'content': 'Second'})
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 2)
+        first, second = Comment.objects.filter(post=self.busy).order_by('pk')
+        self.assertEqual(self.busy.last_commented_at, second.updated_at)
+
+        self.client.post(reverse('update-comment', args=[first.pk]), {'content': 'First, edited'})
+        first.refresh_from_db()
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.last_commented_at, first.updated_at)
+
+        self.client.post(reverse('delete-comment', args=[first.pk]))
+        self.busy.refresh_from_db()
+        self.assertEqual(self.busy.comment_count, 1)
+        self.assertEqual(self.busy.last_commented_at, second.updated_at)
+
+    def test_post_delete_skips_per_comment_updates(self):
+        def delete_queries(comments, delete):
+            post = Post.objects.create(title='Doomed post', content='Body', author=self.user)
+            Comment.objects.bulk_create(Comment(post=post, author=self.user, content='Gone') for _ in range(comments))
+            with CaptureQueriesContext(connection) as queries:
+                delete(post)
+            return len(queries)
+
+        for delete in (lambda post: post.delete(), lambda post: Post.objects.filter(pk=post.pk).delete()):
+            # Warm the ContentType cache first
+            delete_queries(0, delete)
+            self.assertEqual(delete_queries(1, delete), delete_queries(20, delete))
+
+    def test_activity_sort_lists_commented_posts(self):
+        Comment.objects.create(post=self.busy, author=self.user, content='Hi')
+        response = self.client.get(reverse('post-list'), {'sort': 'activity'})
+        self.assertEqual(list(response.context['posts']), [self.busy])
+        self.assertContains(response, '1 comment')
+
+    def test_reconcile_command_repairs_drift(self):
+        Comment.objects.bulk_create(Comment(post=self.quiet, author=self.user, content='Bulk') for _ in range(3))
+        Post.objects.filter(pk=self.busy.pk).update(comment_count=7)
+        call_command('reconcile_comment_counters', stdout=StringIO())
+        self.quiet.refresh_from_db()
+        self.busy.refresh_from_db()
+        self.assertEqual(self.quiet.comment_count, 3)
+        self.assertIsNotNone(self.quiet.last_commented_at)
+        self.assertEqual(self.busy.comment_count, 0)
+        self.assertIsNone(self.busy.last_commented_at)
+
+
+class TagStatTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='tagger', password='testpass123')
+        cls.first = Post.objects.create(title='First', content='Body', author=cls.user)
+        cls.second = Post.objects.create(title='Second', content='Body', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+
+    def counts(self):
+        return dict(TagStat.objects.values_list('tag__slug', 'post_count'))
+
+    def test_counts_follow_tag_changes(self):
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+        self.assertEqual(self.counts(), {'django': 2, 'python': 1})
+
+        self.first.tags.remove('python')
+        self.second.tags.set(['python', 'caching'])
+        self.assertEqual(self.counts(), {'django': 1, 'python': 1, 'caching': 1})
+
+        self.first.tags.clear()
+        self.second.delete()
+        self.assertEqual(self.counts(), {'django': 0, 'python': 0, 'caching': 0})
+
+    def test_tag_cloud_is_cached_until_tags_change(self):
+        self.first.tags.add('django', 'python')
+        self.second.tags.add('django')
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('tag-cloud'))
+        self.assertEqual(response.json()['tags'], [
+            {'name': 'django', 'slug': 'django', 'count': 2},
+            {'name': 'python', 'slug': 'python', 'count': 1},
+        ])
+        with self.assertNumQueries(0):
+            self.client.get(reverse('tag-cloud'))
+
+        self.second.tags.add('python')
+        counts = {tag['slug']: tag['count'] for tag in self.client.get(reverse('tag-cloud')).json()['tags']}
+        self.assertEqual(counts, {'django': 2, 'python': 2})
+
+    def test_post_list_prefetches_tags(self):
+        for i in range(5):
+            Post.objects.create(title=f'Tagged {i}', content='Body', author=self.user).tags.add(f'tag-{i}', 'shared')
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post-list'))
+        self.assertContains(response, 'tag-4')
+
+    def test_reconcile_command_repairs_drift(self):
+        self.first.tags.add('django')
+        TagStat.objects.update(post_count=9)
+        call_command('reconcile_tag_counts', stdout=StringIO())
+        self.assertEqual(self.counts(), {'django': 1})
+
+
+class DatabaseSettingsTests(SimpleTestCase):
+    # Nothing listens on port 1, so Postgres counts as unavailable
+    env = {'BLOG_DB_HOST': '127.0.0.1', 'BLOG_DB_PORT': '1'}
+
+    def test_persistent_connections_by_default(self):
+        config = database_settings(self.env, argv=['manage.py', 'runserver'])
+        self.assertEqual(config['ENGINE'], 'django.db.backends.postgresql')
+        self.assertEqual(config['CONN_MAX_AGE'], 60)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+        self.assertNotIn('pool', config['OPTIONS'])
+
+    def test_pooled_mode(self):
+        env = {**self.env, 'BLOG_DB_POOL': '1', 'BLOG_DB_POOL_MIN_SIZE': '4', 'BLOG_DB_POOL_MAX_SIZE': '20'}
+        config = database_settings(env, argv=['manage.py', 'runserver'])
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool']['min_size'], 4)
+        self.assertEqual(config['OPTIONS']['pool']['max_size'], 20)
+        self.assertEqual(config['OPTIONS']['pool']['timeout'], 10.0)
+
+    def test_invalid_pool_sizes(self):
+        env = {**self.env, 'BLOG_DB_POOL': '1', 'BLOG_DB_POOL_MIN_SIZE': '5', 'BLOG_DB_POOL_MAX_SIZE': '2'}
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings(env, argv=['manage.py', 'runserver'])
+        with self.assertRaises(ImproperlyConfigured):
+            database_settings({**env, 'BLOG_DB_POOL_MAX_SIZE': 'many'}, argv=['manage.py', 'runserver'])
+
+    def test_tests_fall_back_to_sqlite_without_postgres(self):
+        config = database_settings(self.env, base_dir='/srv/blog', argv=['manage.py', 'test'])
+        self.assertEqual(config['ENGINE'], 'django.db.backends.sqlite3')
+        self.assertEqual(config['NAME'], '/srv/blog/db.sqlite3')
+
+
+class DatabasePoolStatsViewTests(TestCase):
+
+    def test_staff_only(self):
+        url = reverse('db-pool-stats')
+        self.assertEqual(self.client.get(url).status_code, 302)
+        staff = User.objects.create_user(username='ops', password='pass12345', is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(url)
+        self.assertEqual(response.json(), {'pooled': False, 'stats': {}})
+
+
+class QueryInstrumentationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='ops', password='pass12345', is_staff=True)
+        Post.objects.create(title='Timed', content='Body', author=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        clear_stats()
+
+    @override_settings(SERVER_TIMING=True)
+    def test_server_timing_header(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post-list'))
+        self.assertIn('db;dur=', response['Server-Timing'])
+        self.assertIn('desc="2 queries"', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_server_timing_header_is_off_without_debug(self):
+        self.assertNotIn('Server-Timing', self.client.get(reverse('post-list')))
+
+    def test_duplicate_statements_are_counted(self):
+        stats = RequestQueryStats()
+        for _ in range(3):
+            stats.record('SELECT * FROM blog_comment WHERE post_id = %s', 0.001)
+        stats.record('SELECT * FROM blog_post', 0.001)
+        self.assertEqual(stats.duplicates, 2)
+        self.assertEqual(stats.top_duplicates()[0]['count'], 3)
+
+    def test_stats_endpoint(self):
+        self.client.get(reverse('post-list'))
+        url = reverse('query-stats')
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.user)
+        data = self.client.get(url).json()
+        recent = data['recent'][-1]
+        self.assertEqual(recent['view'], 'post-list')
+        self.assertEqual(recent['queries'], 2)
+        self.assertEqual(data['views']['post-list']['requests'], 1)
@@ -3,7 +3,7 @@ from django.contrib.auth import views as auth_views
 from . import views
 from .views import PostByTagListView
 from .views import (
-    PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView
+    PostListView, PostDetailView, PostCreateView, PostUpdateView, PostDeleteView, CommentCreateView
 )
 
 urlpatterns = [
@@ -20,8 +20,10 @@ urlpatterns = [
     path('comment/<int:pk>/delete/', views.delete_comment, name='delete-comment'),
     path('post/<int:pk>/comments/new/', CommentCreateView.as_view(), name='comment-create'),
     path('posts/', views.post_list, name='post_list'),
-    path('tags/<slug:tag_slug>/', views.post_list, name='post_tag'),
+    path('tags/<slug:tag_slug>/', PostByTagListView.as_view(), name='post_tag'),
     path('search/', views.post_list, name='post_search'),
     path('tags/<slug:tag_slug>/', PostByTagListView.as_view(), name='posts-by-tag'),
+    path('tag-cloud/', views.tag_cloud, name='tag-cloud'),
+    path('db/pool/', views.db_pool_stats, name='db-pool-stats'),
 ]
 
@@ -6,10 +6,21 @@ from django.contrib.auth.models import User
 from django.urls import reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
-from .models import Post, Comment
+from .models import Post, Comment, TagStat
 from .forms import CommentForm
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from .search import search_posts
+from .pagination import KeysetPage, KeysetPaginationMixin
+from .caching import get_post_list_version, POST_LIST_CACHE_TIMEOUT, TAG_CLOUD_CACHE_KEY, TAG_CLOUD_CACHE_TIMEOUT
+from .counters import popular_tags
+from django.core.cache import cache
+import hashlib
+from django.conf import settings
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import JsonResponse
+from django_blog.database import pool_stats
 
 
 # Create your views here.
@@ -35,16 +46,93 @@ def profile(request):
             return redirect('profile')
     return render(request, 'blog/profile.html', {'user': request.user})
 
-class PostListView(ListView):
+class CachedPostPageMixin(KeysetPaginationMixin):
+    """
+    Pages posts newest first and exposes a cache key for the rendered page.
+    The key embeds the post list version, which is bumped whenever a post,
+    comment, tag or author name changes, so stale pages are never served.
+    """
+    # ?sort=activity lists recently commented posts using the denormalized field
+    sort_fields = {'recent': 'published_date', 'activity': 'last_commented_at'}
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['page_cache_key'] = ':'.join([
+            str(get_post_list_version()),
+            self.kwargs.get('tag_slug', ''),
+            context['sort'],
+            context['page'].cursor or '',
+        ])
+        context['page_cache_timeout'] = POST_LIST_CACHE_TIMEOUT
+        return context
+
+class PostListView(CachedPostPageMixin, ListView):
     model = Post
     template_name = 'blog/post_list.html'  # create this template
     context_object_name = 'posts'
     ordering = ['-published_date']  # show latest posts first
 
+    def get_queryset(self):
+        # Tags of the whole page in one extra query
+        return super().get_queryset().select_related('author').prefetch_related('tags')
+
+COMMENTS_PER_PAGE = 50
+
+def post_detail_queryset():
+    # Post, author and tags in two queries; comments come from comment_window()
+    return Post.objects.select_related('author').prefetch_related('tags')
+
+def comment_window(request, post):
+    """Newest comments first, one window at a time, each with its author."""
+    return KeysetPage(
+        post.comments.select_related('author'),
+        COMMENTS_PER_PAGE,
+        request.GET.get('comments_after'),
+        field='created_at',
+    )
+
+def post_detail_validators(request, pk):
+    """
+    (etag, last_modified) for a post page, from one narrow query on the post
+    row; the denormalized comment stats stand in for the comment list.
+    The page embeds the CSRF token and per-user links, so the tag varies by
+    user and CSRF cookie, and no validators are offered without a cookie.
+    """
+    if not hasattr(request, '_post_detail_validators'):
+        validators = (None, None)
+        csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME)
+        stats = None
+        if csrf_cookie:
+            stats = Post.objects.filter(pk=pk).values('updated_at', 'comment_count', 'last_commented_at').first()
+        if stats:
+            parts = [pk, stats['updated_at'], stats['comment_count'], stats['last_commented_at'],
+                     request.user.pk, csrf_cookie, request.get_full_path()]
+            etag = hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+            last_modified = max(filter(None, [stats['updated_at'], stats['last_commented_at']]))
+            validators = (etag, last_modified)
+        request._post_detail_validators = validators
+    return request._post_detail_validators
+
+def post_detail_etag(request, pk):
+    return post_detail_validators(request, pk)[0]
+
+def post_detail_last_modified(request, pk):
+    return post_detail_validators(request, pk)[1]
+
+@method_decorator(condition(etag_func=post_detail_etag, last_modified_func=post_detail_last_modified), name='get')
 class PostDetailView(DetailView):
     model = Post
     template_name = 'blog/post_detail.html'  # create this template
 
+    def get_queryset(self):
+        return post_detail_queryset()
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['comments'] = comment_window(self.request, self.object)
+        context['form'] = CommentForm()
+        return context
+
 class PostCreateView(LoginRequiredMixin, CreateView):
     model = Post
     fields = ['title', 'content']
@@ -78,8 +166,8 @@ class PostDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 
 
 def post_detail(request, pk):
-    post = get_object_or_404(Post, pk=pk)
-    comments = post.comments.all().order_by('-created_at')
+    post = get_object_or_404(post_detail_queryset(), pk=pk)
+    comments = comment_window(request, post)
     if request.method == 'POST':
         if not request.user.is_authenticated:
             return redirect('login')
@@ -95,8 +183,8 @@ def post_detail(request, pk):
     return render(request, 'blog/post_detail.html', {'post': post, 'comments': comments, 'form': form})
 
 @login_required
-def edit_comment(request, comment_id):
-    comment = get_object_or_404(Comment, pk=comment_id, author=request.user)
+def edit_comment(request, pk):
+    comment = get_object_or_404(Comment, pk=pk, author=request.user)
     if request.method == 'POST':
         form = CommentForm(request.POST, instance=comment)
         if form.is_valid():
@@ -107,8 +195,8 @@ def edit_comment(request, comment_id):
     return render(request, 'blog/edit_comment.html', {'form': form})
 
 @login_required
-def delete_comment(request, comment_id):
-    comment = get_object_or_404(Comment, pk=comment_id, author=request.user)
+def delete_comment(request, pk):
+    comment = get_object_or_404(Comment, pk=pk, author=request.user)
     post_pk = comment.post.pk
     if request.method == 'POST':
         comment.delete()
@@ -116,12 +204,6 @@ def delete_comment(request, comment_id):
     return render(request, 'blog/delete_comment.html', {'comment': comment})
 
 
-class CommentCreateView(LoginRequiredMixin, CreateView):
-from django.urls import reverse_lazy
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import CreateView, UpdateView, DeleteView
-from .models import Comment
-
 class CommentCreateView(LoginRequiredMixin, CreateView):
     model = Comment
     fields = ['content']
@@ -129,11 +211,11 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post_id = self.kwargs['post_id']  # pass post_id via URL
+        form.instance.post_id = self.kwargs['pk']  # pass the post's pk via URL
         return super().form_valid(form)
 
     def get_success_url(self):
-        return reverse_lazy('post-detail', kwargs={'pk': self.kwargs['post_id']})
+        return reverse_lazy('post-detail', kwargs={'pk': self.kwargs['pk']})
 
 class CommentUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     model = Comment
@@ -162,21 +244,39 @@ class CommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
 def post_list(request):
     query = request.GET.get('q')
     if query:
-        posts = Post.objects.filter(
-            Q(title__icontains=query) | Q(content__icontains=query) |  Q(tags__name__icontains=query)
-        ).distinct()
+        # Indexed full-text search, ranked best match first (see blog/search.py)
+        posts = search_posts(Post.objects.select_related('author').prefetch_related('tags'), query)
     else:
-        posts = Post.objects.all()
+        posts = Post.objects.select_related('author').prefetch_related('tags')
     return render(request, 'blog/post_list.html', {'posts': posts, 'query': query})
 
 
-class PostByTagListView(ListView):
+class PostByTagListView(CachedPostPageMixin, ListView):
     model = Post
     template_name = 'blog/post_list.html'
     context_object_name = 'posts'
 
     def get_queryset(self):
         tag_slug = self.kwargs.get('tag_slug')
+        posts = Post.objects.select_related('author').prefetch_related('tags')
         if tag_slug:
-            return Post.objects.filter(tags__slug=tag_slug)
-        return Post.objects.all()
+            return posts.filter(tags__slug=tag_slug)
+        return posts
+
+
+TAG_CLOUD_SIZE = 50
+
+def tag_cloud(request):
+    """Most used tags with their post counts, read from TagStat and cached."""
+    tags = cache.get(TAG_CLOUD_CACHE_KEY)
+    if tags is None:
+        tags = popular_tags(TagStat, TAG_CLOUD_SIZE)
+        cache.set(TAG_CLOUD_CACHE_KEY, tags, TAG_CLOUD_CACHE_TIMEOUT)
+    return JsonResponse({'tags': tags})
+
+
+@staff_member_required
+def db_pool_stats(request):
+    """Pool size and wait-time counters of this process's database pool."""
+    stats = pool_stats()
+    return JsonResponse({'pooled': stats is not None, 'stats': stats or {}})
@@ -0,0 +1,133 @@
+"""
+Database settings for django_blog, read from BLOG_DB_* environment variables.
+
+Two ways to avoid a new Postgres connection (TCP + auth handshake) per request:
+
+* persistent (default): each worker keeps its connection for
+  BLOG_DB_CONN_MAX_AGE seconds and health-checks it before reuse.
+* pooled (BLOG_DB_POOL=1): a psycopg_pool ConnectionPool of
+  BLOG_DB_POOL_MIN_SIZE..BLOG_DB_POOL_MAX_SIZE connections shared by the
+  threads of a process. Requests wait at most BLOG_DB_POOL_TIMEOUT seconds
+  for a free connection. Needs psycopg 3 (`pip install "psycopg[pool]"`).
+
+When running the test suite without a reachable Postgres server the
+settings fall back to SQLite.
+"""
+import os
+import socket
+import sys
+
+from django.core.exceptions import ImproperlyConfigured
+
+DEFAULTS = {
+    'BLOG_DB_ENGINE': 'postgresql',
+    'BLOG_DB_NAME': 'TEST_DB',
+    'BLOG_DB_USER': 'admin',
+    'BLOG_DB_PASSWORD': 'password',
+    'BLOG_DB_HOST': 'localhost',
+    'BLOG_DB_PORT': '5432',
+    'BLOG_DB_CONN_MAX_AGE': '60',
+    'BLOG_DB_HEALTH_CHECKS': '1',
+    'BLOG_DB_POOL': '0',
+    'BLOG_DB_POOL_MIN_SIZE': '2',
+    'BLOG_DB_POOL_MAX_SIZE': '10',
+    'BLOG_DB_POOL_TIMEOUT': '10',
+    'BLOG_DB_POOL_MAX_IDLE': '600',
+    'BLOG_DB_POOL_MAX_LIFETIME': '3600',
+}
+
+
+def _flag(value):
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _int(env, name):
+    try:
+        return int(env[name])
+    except ValueError:
+        raise ImproperlyConfigured(f'{name} must be an integer, got {env[name]!r}.')
+
+
+def _float(env, name):
+    try:
+        return float(env[name])
+    except ValueError:
+        raise ImproperlyConfigured(f'{name} must be a number, got {env[name]!r}.')
+
+
+def postgres_available(host, port, timeout=0.5):
+    try:
+        socket.create_connection((host, int(port)), timeout=timeout).close()
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def running_tests(argv=None):
+    argv = sys.argv if argv is None else argv
+    return len(argv) > 1 and argv[1] == 'test'
+
+
+def database_settings(env=None, base_dir=None, argv=None):
+    """Build the DATABASES['default'] dict from `env` (os.environ by default)."""
+    env = {**DEFAULTS, **(os.environ if env is None else env)}
+    engine = env['BLOG_DB_ENGINE']
+
+    if engine == 'postgresql' and running_tests(argv) and not postgres_available(env['BLOG_DB_HOST'], env['BLOG_DB_PORT']):
+        engine = 'sqlite'
+    if engine == 'sqlite':
+        return {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(base_dir or '', 'db.sqlite3'),
+        }
+    if engine != 'postgresql':
+        raise ImproperlyConfigured(f"BLOG_DB_ENGINE must be 'postgresql' or 'sqlite', got {engine!r}.")
+
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env['BLOG_DB_NAME'],
+        'USER': env['BLOG_DB_USER'],
+        'PASSWORD': env['BLOG_DB_PASSWORD'],
+        'HOST': env['BLOG_DB_HOST'],
+        'PORT': env['BLOG_DB_PORT'],
+        # Checked on reuse; with a pool this becomes the pool's connection check
+        'CONN_HEALTH_CHECKS': _flag(env['BLOG_DB_HEALTH_CHECKS']),
+        'CONN_MAX_AGE': _int(env, 'BLOG_DB_CONN_MAX_AGE'),
+        'OPTIONS': {},
+    }
+    if _flag(env['BLOG_DB_POOL']):
+        min_size, max_size = _int(env, 'BLOG_DB_POOL_MIN_SIZE'), _int(env, 'BLOG_DB_POOL_MAX_SIZE')
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ImproperlyConfigured(
+                f'Need 0 <= BLOG_DB_POOL_MIN_SIZE <= BLOG_DB_POOL_MAX_SIZE and a max of at least 1, '
+                f'got {min_size} and {max_size}.'
+            )
+        # Django refuses persistent connections on top of a pool
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': min_size,
+            'max_size': max_size,
+            'timeout': _float(env, 'BLOG_DB_POOL_TIMEOUT'),
+            'max_idle': _float(env, 'BLOG_DB_POOL_MAX_IDLE'),
+            'max_lifetime': _float(env, 'BLOG_DB_POOL_MAX_LIFETIME'),
+            'name': 'django_blog',
+        }
+    return config
+
+
+def pool_stats(alias='default'):
+    """
+    Counters of the connection pool behind `alias`, or None when it is not
+    pooled. `requests_wait_ms` / `requests_num` is the mean time a request
+    waited for a free connection; `requests_queued` counts those that had to
+    wait at all and `requests_errors` those that timed out.
+    """
+    from django.db import connections
+
+    pool = getattr(connections[alias], 'pool', None)
+    if pool is None:
+        return None
+    stats = pool.get_stats()
+    requests = stats.get('requests_num', 0)
+    stats['avg_wait_ms'] = round(stats.get('requests_wait_ms', 0) / requests, 3) if requests else 0.0
+    return stats